@@ -1,18 +1,137 @@
 #!/usr/bin/env python3
-from itertools import pairwise, accumulate
+from array import array
+from itertools import accumulate, islice, repeat
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from mmap import mmap, ACCESS_READ
+from operator import lt
+import os
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-def main():
-    from sys import argv
-    with open(argv[1]) as file:
-        depths = read(file)
-
-    print('part[1]:', count_increases(depths))
-    print('part[2]:', count_increases(sliding_window(depths, 3)))
+LARGE = 64<<20      # bytes of log to switch to scanning in parallel
+CHUNK = 16<<20      # bytes of log scanned by each worker task
+BLOCK = 1<<20       # bytes parsed at once, bounding memory of each worker
 
 
-def count_increases(depths):
-    return sum(d0 < d1 for d0,d1 in pairwise(depths))
+def main():
+    from sys import argv, stdin
+    if argv[1] != '-' and os.path.getsize(argv[1]) > LARGE:
+        # (very) large logs are split across worker processes
+        part1, part2 = scan(argv[1])
+        print('part[1]:', part1)
+        print('part[2]:', part2)
+        return
+
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
+        part = solve_stream(iread(file))
+        print('part[1]:', next(part))
+        print('part[2]:', next(part))
+
+
+def solve(depths):
+    yield count_increases(depths)
+    yield count_increases(depths, 3)
+
+
+# both parts in one pass, holding only the last window of depths:
+# sums of windows differ by the first and last depths, ie d[i] vs d[i+3]
+def solve_stream(depths):
+    win = deque(maxlen=3)
+    n1 = n3 = 0
+    for d in depths:
+        if win:
+            n1 += win[-1] < d
+            if len(win) == 3:
+                n3 += win[0] < d
+        win.append(d)
+    yield n1
+    yield n3
+
+
+# increases of sums over windows of n, in one pass over any iterable:
+# consecutive sums only differ by d[i+n] - d[i], so just compare those,
+# keeping the last n depths in a ring buffer
+def count_increases(depths, n=1):
+    depths = iter(depths)
+    win = deque(islice(depths, n), maxlen=n)
+    count = 0
+    for d in depths:
+        count += win[0] < d
+        win.append(d)
+    return count
+
+
+# count_increases() of a log file for each window size, mapped in chunks
+# split at line boundaries and counted in parallel
+def scan(path, windows=(1, 3), jobs=None, chunk=CHUNK):
+    if not os.path.getsize(path):
+        return [ 0 for _ in windows ]
+    with open(path, 'rb') as file, \
+         mmap(file.fileno(), 0, access=ACCESS_READ) as buf:
+        chunks = list(split_chunks(buf, chunk))
+
+    args = repeat(path), chunks, repeat(windows)
+    if jobs == 1 or len(chunks) == 1:
+        counts = list(map(scan_chunk, *args))
+    else:
+        with ProcessPoolExecutor(jobs) as pool:
+            counts = list(pool.map(scan_chunk, *args))
+    return [ sum(c) for c in zip(*counts) ]
+
+
+def split_chunks(buf, size, start=0, end=None):
+    i, end = start, len(buf) if end is None else end
+    while i < end:
+        j = buf.find(b'\n', i + size, end) + 1 or end
+        yield i, j
+        i = j
+
+
+# increases (d[i] < d[i+n]) for each window n, that end within chunk
+# [i0, i1).  the depths preceding the chunk are parsed first, to stitch
+# across the boundary, then the chunk in blocks, each carrying the last
+# depths of the one before
+def scan_chunk(path, chunk, windows=(1, 3)):
+    i0, i1 = chunk
+    back = max(windows)
+    counts = [ 0 for _ in windows ]
+    with open(path, 'rb') as file, \
+         mmap(file.fileno(), 0, access=ACCESS_READ) as buf:
+        j = i0
+        for _ in range(back):
+            if j <= 0:
+                break
+            j = buf.rfind(b'\n', 0, j-1) + 1
+        carry = parse_block(buf[j:i0])
+
+        for b0, b1 in split_chunks(buf, BLOCK, i0, i1):
+            depths = concat(carry, parse_block(buf[b0:b1]))
+            for k, n in enumerate(windows):
+                counts[k] += count_pairs(depths, n, max(n, len(carry)))
+            carry = depths[-back:]
+    return counts
+
+
+# bulk conversion, without a Python loop per line when NumPy is available
+def parse_block(text):
+    if np is not None:
+        return np.fromstring(text, dtype=np.int64, sep='\n')
+    return array('q', map(int, text.split()))
+
+
+def concat(a, b):
+    return np.concatenate((a, b)) if np is not None else a + b
+
+
+# pairs d[i] < d[i+n] where i+n >= j0
+def count_pairs(depths, n, j0):
+    if np is not None:
+        return int((depths[j0-n:-n] < depths[j0:]).sum())
+    return sum(map(lt, islice(depths, j0-n, None), islice(depths, j0, None)))
 
 
 def sliding_window(data, n=3):
@@ -22,7 +141,11 @@ def sliding_window(data, n=3):
 
 
 def read(file):
-    return [ int(l) for l in file ]
+    return list(iread(file))
+
+
+def iread(file):
+    return (int(l) for l in file)
 
 
 if __name__ == '__main__':
@@ -51,9 +174,47 @@ def test2_ex0(data):
 
 def test2_answer(data):
     assert count_increases(sliding_window(read(data('input.txt')))) == 1781
+    assert count_increases(iread(data('input.txt')), 3) == 1781
+
+def test_windows(data):
+    depths = read(data('input.txt'))
+    for n in (1, 2, 3, 7, 100):
+        sums = sliding_window(depths, n)
+        assert count_increases(iter(depths), n) == count_increases(sums)
+    assert count_increases([ 1, 2 ], 2) == 0
+
+def test_scan(tmp_path, monkeypatch):
+    from random import Random
+    rng = Random(1)
+    depths = [ rng.randrange(10000) for _ in range(1000) ]
+    path = tmp_path/'depths.txt'
+    path.write_text(''.join(f'{d}\n' for d in depths))
+    windows = (1, 3, 50)
+    exp = [ count_increases(depths, n) for n in windows ]
+
+    for bulk in (np, None):
+        monkeypatch.setattr(__import__(__name__), 'np', bulk)
+        assert scan(path, windows) == exp
+        assert scan(path, windows, jobs=1, chunk=100) == exp
+        monkeypatch.setattr(__import__(__name__), 'BLOCK', 30)
+        assert scan(path, windows, jobs=1, chunk=1000) == exp
+        assert scan(path, windows, jobs=2, chunk=7) == exp
+        monkeypatch.undo()
+
+    assert list(split_chunks(b'1\n22\n333\n4', 2)) \
+        == [ (0, 5), (5, 9), (9, 10) ]
+    assert list(split_chunks(b'1\n22\n333\n4', 2, 2, 9)) \
+        == [ (2, 5), (5, 9) ]
+    path.write_text('')
+    assert scan(path) == [ 0, 0 ]
 
 
 #------------------------------------------------------------------------------
+def test_stream(data):
+    for f in ('ex0.txt', 'input.txt'):
+        assert list(solve_stream(iread(data(f)))) \
+            == list(solve(read(data(f))))
+
 def test_ex0(ascript):
     assert ascript('ex0.txt') == '''\
 part[1]: 7
@@ -61,7 +222,7 @@ part[2]: 5
 '''
 
 def test_input(ascript):
-    assert ascript('input.txt') == '''\
+    assert ascript('input.txt', stdin=True) == '''\
 part[1]: 1752
 part[2]: 1781
 '''
@@ -1,15 +1,30 @@
 #!/usr/bin/env python3
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
 from itertools import accumulate
-from operator import mul
+from operator import add, mul, itemgetter
+from typing import NamedTuple
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
-        cmds = read(file)
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
+        part = solve_stream(iread(file))
+        print('part[1]:', next(part))
+        print('part[2]:', next(part))
 
-    print('part[1]:', mul(*track_position(cmds)))
-    print('part[2]:', mul(*track_aimed(cmds)))
+
+def solve(cmds):
+    yield mul(*track_position(cmds))
+    yield mul(*track_aimed(cmds))
+
+
+# both parts in one pass: depth without aim (part 1) *is* aim (part 2)
+def solve_stream(cmds):
+    seg = summarize(cmds)
+    yield seg.pos*seg.aim
+    yield seg.pos*seg.depth
 
 
 def track_position(cmds):
@@ -17,13 +32,73 @@ def track_position(cmds):
 
 
 def track_aimed(cmds):
-    aim = accumulate(Δa for _,Δa in cmds)  # pragma: no branch
-    return (sum(Δp for Δp,_ in cmds),
-            sum(Δp*a for (Δp,_),a in zip(cmds, aim)))
+    seg = summarize(cmds)
+    return seg.pos, seg.depth
+
+
+# variants over columns of (Δpos, Δaim), without a loop in Python
+def track_position_columns(pos, aim):
+    return sum(pos), sum(aim)
+
+
+def track_aimed_columns(pos, aim):
+    return sum(pos), sum(map(mul, pos, accumulate(aim)))
+
+
+# net effect of a run of commands, starting from 0 aim.  segments form a
+# monoid: following segment b moves b.pos further at a.aim more than it
+# assumed, so they may be summarized independently (in parallel, or as
+# commands are appended to a log) and combined in order
+class Segment(NamedTuple):
+    pos: int = 0
+    aim: int = 0
+    depth: int = 0
+
+    def __add__(a, b):
+        return Segment(a.pos + b.pos, a.aim + b.aim,
+                       a.depth + b.depth + a.aim*b.pos)
+
+
+def summarize(cmds):
+    pos = aim = depth = 0
+    for Δp,Δa in cmds:
+        pos += Δp
+        aim += Δa
+        depth += Δp*aim
+    return Segment(pos, aim, depth)
+
+
+def summarize_chunks(cmds, jobs=None, chunk=1<<16):
+    chunks = [ cmds[i:i+chunk] for i in range(0, len(cmds), chunk) ]
+    with ProcessPoolExecutor(jobs) as pool:
+        return reduce(add, pool.map(summarize, chunks), Segment())
 
 
 def read(file):
-    return [ parse_cmd(l) for l in file ]
+    return list(iread(file))
+
+
+def iread(file):
+    return (parse_cmd(l) for l in file)
+
+
+# compact columns of Δpos and Δaim (8 bytes per command, vs ~100 for tuples),
+# bulk parsed in blocks of lines (bounding the temporary word lists), with
+# keywords dispatched on their first letter
+POS = bytes.maketrans(b'fdu', b'\1\0\0')
+AIM = bytes.maketrans(b'fdu', b'\0\1\xff')
+
+def read_columns(file, hint=1<<16):
+    pos, aim = array('i'), array('i')
+    while lines := file.readlines(hint):
+        words = ''.join(lines).split()
+        n = array('i', map(int, words[1::2]))
+        key = ''.join(map(itemgetter(0), words[0::2])).encode()
+        if key.translate(None, b'fdu'):
+            raise ValueError(key.translate(None, b'fdu')[:1].decode())
+        pos.extend(map(mul, n, array('b', key.translate(POS))))
+        aim.extend(map(mul, n, array('b', key.translate(AIM))))
+    return pos, aim
 
 
 def parse_cmd(cmd):
@@ -62,7 +137,45 @@ def test2_answer(data):
     assert track_aimed(read(data('input.txt'))) == (2007, 668080)
 
 
+def test_segment(data):
+    cmds = read(data('input.txt'))
+    whole = summarize(cmds)
+    assert whole == (2007, 747, 668080)
+    for i, j in ((0, 0), (1, 999), (250, 750), (500, 1000)):
+        parts = [ summarize(c) for c in (cmds[:i], cmds[i:j], cmds[j:]) ]
+        assert (parts[0] + parts[1]) + parts[2] == whole
+        assert parts[0] + (parts[1] + parts[2]) == whole
+    assert Segment() + whole == whole + Segment() == whole
+    assert summarize_chunks(cmds, 2, chunk=300) == whole
+
+def test_columns(data):
+    for f in ('ex0.txt', 'input.txt'):
+        pos, aim = read_columns(data(f))
+        cmds = read(data(f))
+        assert list(zip(pos, aim)) == cmds
+        assert track_position_columns(pos, aim) == track_position(cmds)
+        assert track_aimed_columns(pos, aim) == track_aimed(cmds)
+        assert read_columns(data(f), hint=10) == (pos, aim)
+
+def test_columns_invalid():
+    from io import StringIO
+    import pytest
+    with pytest.raises(ValueError):
+        read_columns(StringIO('forward 5\nback 3\n'))
+
+def test_append(data):
+    cmds = read(data('ex0.txt'))
+    seg = summarize(cmds[:3])
+    seg += summarize(cmds[3:])
+    assert (seg.pos, seg.depth) == (15, 60)
+
+
 #------------------------------------------------------------------------------
+def test_stream(data):
+    for f in ('ex0.txt', 'input.txt'):
+        assert list(solve_stream(iread(data(f)))) \
+            == list(solve(read(data(f))))
+
 def test_ex0(ascript):
     assert ascript('ex0.txt') == '''\
 part[1]: 150
@@ -70,7 +183,7 @@ part[2]: 900
 '''
 
 def test_input(ascript):
-    assert ascript('input.txt') == '''\
+    assert ascript('input.txt', stdin=True) == '''\
 part[1]: 1499229
 part[2]: 1340836560
 '''
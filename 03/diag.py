@@ -1,17 +1,33 @@
 #!/usr/bin/env python3
+from array import array
+from bisect import bisect_left
+from itertools import repeat
+from operator import and_
+from typing import NamedTuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
         data = read(file)
 
-    print('part[1]:', power(data))
-    print('part[2]:', lifesupport(data))
+    part = solve(data)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
+
+def solve(data):
+    yield power(data)
+    yield lifesupport(data)
 
 
 def power(data):
     γ = γ_rate(data)
-    ε = γ ^ (1 << len(data[0]))-1
+    ε = γ ^ (1 << data.width)-1
     return γ * ε
 
 
@@ -21,26 +37,64 @@ def lifesupport(data):
     return o2 * co2
 
 
+# words sharing a prefix are a contiguous range of the sorted array,
+# which splits at the first word with the next bit set: narrow the range
+# by binary search, rather than filtering lists
 def filter_diags(data, crit):
-    for b in reversed(range(len(data[0]))):
-        if len(data) == 1:
+    words, width = data
+    lo, hi, prefix = 0, len(words), 0
+    for b in reversed(range(width)):
+        if hi - lo == 1:
             break
-        gb = γ_bit(data, b)
-        data = [ d for d in data if d[b] ^ crit == gb ]
-    assert len(data) == 1
-    return sum(d<<b for b,d in enumerate(data[0]))
+        m = bisect_left(words, prefix | 1<<b, lo, hi)
+        most = int(2*(hi - m) >= hi - lo)
+        # NB keep whichever side is not empty, when all bits match
+        if most ^ crit and m < hi or m == lo:
+            lo, prefix = m, prefix | 1<<b
+        else:
+            hi = m
+    assert words[lo] == words[hi-1]     # (only duplicates left)
+    return words[lo]
 
 
 def γ_rate(data):
-    return sum(γ_bit(data, b) << b for b in range(len(data[0])))
+    n = len(data.words)
+    return sum(1<<b for b,k in enumerate(column_counts(*data)) if 2*k >= n)
+
+
+# number of words with each bit set
+def column_counts(words, width):
+    if np is None:
+        return [ popcount(words, b) for b in range(width) ]
 
+    # unpack words as little endian bytes, then sum down columns of bits.
+    # array('Q') words are viewed in place, only wide ints are packed
+    if isinstance(words, array):
+        buf = np.frombuffer(words, dtype=np.uint64).astype('<u8', copy=False)
+        nb = 8
+    else:
+        nb = (width + 7) // 8
+        buf = b''.join(map(int.to_bytes, words, repeat(nb), repeat('little')))
+    bits = np.unpackbits(np.frombuffer(buf, dtype=np.uint8).reshape(-1, nb),
+                         axis=1, bitorder='little')
+    return bits.sum(axis=0)[:width].tolist()
 
-def γ_bit(data, bit):
-    return int(2*sum(d[bit] for d in data) >= len(data))
+
+# (mask and shift in C, not per word in Python)
+def popcount(words, bit):
+    return sum(map(and_, words, repeat(1<<bit))) >> bit
+
+
+class Diags(NamedTuple):
+    words: array    # sorted (list of ints for words wider than 64 bits)
+    width: int
 
 
 def read(file):
-    return [ tuple(int(b) for b in reversed(l.strip())) for l in file ]
+    lines = [ l.strip() for l in file ]
+    width = len(lines[0])
+    words = sorted(int(l, 2) for l in lines)
+    return Diags(array('Q', words) if width <= 64 else words, width)
 
 
 if __name__ == '__main__':
@@ -71,6 +125,32 @@ def test2_ex0(data):
 def test2_answer(data):
     assert lifesupport(read(data('input.txt'))) == 2135254
 
+def test_wide():
+    from random import Random
+    rng = Random(3)
+    for width in (5, 64, 65, 200):
+        lines = [ f'{rng.getrandbits(width):0{width}b}\n' for _ in range(500) ]
+        data = read(lines)
+        assert isinstance(data.words, array) == (width <= 64)
+        assert column_counts(*data) \
+            == [ popcount(data.words, b) for b in range(width) ]
+
+        # reference: filter lists of bit strings one column at a time
+        for crit in (0, 1):
+            rem = [ l.strip() for l in lines ]
+            for b in range(width):
+                if len(rem) < 2:
+                    break
+                most = '01'[2*sum(r[b] == '1' for r in rem) >= len(rem)]
+                keep = [ r for r in rem if (r[b] == most) ^ crit ]
+                rem = keep or rem
+            assert filter_diags(data, crit) == int(rem[0], 2)
+
+def test2_same():
+    diags = Diags(array('Q', [ 0b100, 0b101 ]), 3)
+    assert filter_diags(diags, 0) == 0b101
+    assert filter_diags(diags, 1) == 0b100
+
 
 #------------------------------------------------------------------------------
 def test_ex0(ascript):
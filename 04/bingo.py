@@ -1,48 +1,118 @@
 #!/usr/bin/env python3
-from itertools import chain
-from collections import defaultdict, Counter
+from array import array
+from collections import defaultdict
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-def main():
-    from sys import argv
-    with open(argv[1]) as file:
-        draws, boards = read(file)
-
-    scores = play(draws, boards)
-    print('part[1]:', first(scores)[1])
-    print('part[2]:', last(scores)[1])
-
-
-def play(draws, boards):
-    scores = { }
-    marks = Counter()
 
-    def board_score(winner, undrawn):
-        return sum(u*is_onboard(boards[u], winner) for u in undrawn)
-
-    for i,n in enumerate(draws):
-        for win in round(boards, n, marks):
-            if (winner := win[0]) not in scores:
-                scores[winner] = n * board_score(winner, draws[i+1:])
+def main():
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
+        game = read(file)
 
-    return scores
+    part = solve(game)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
 
 
-def round(boards, num, marks):
-    return chain(
-        (m for b,r,c in boards[num] if (m := mark(marks, (b,0,r)))),
-        (m for b,r,c in boards[num] if (m := mark(marks, (b,1,c))))
-    )
+def solve(game, backend='python'):
+    scores = backends[backend](*game)
+    yield first(scores)[1]
+    yield last(scores)[1]
 
 
-def mark(marks, key):
-    n = marks[key] = marks[key] + 1
-    assert n <= 5
-    if n == 5: return key
+# each board is a 25 bit mask of marked cells (bit 5*row + col), checked
+# against the masks of the row and column of each newly marked cell
+ROW = tuple(0b11111 << 5*(i//5) for i in range(25))
+COL = tuple(0b00001_00001_00001_00001_00001 << i%5 for i in range(25))
 
 
-def is_onboard(locs, board):
-    return sum(int(l[0] == board) for l in locs)
+def play(draws, boards):
+    game = Game(boards)
+    for n in draws:
+        game.draw(n)
+    return game.scores
+
+
+# online game: winners are scored as soon as each number is drawn
+class Game:
+    def __init__(self, boards):
+        self.start, self.pboard, self.pbit = postings(boards)
+        self.nboards = nb = 1 + max(self.pboard, default=-1)
+        self.marks = array('L', [ 0 ])*nb
+        self.unmarked = array('q', [ 0 ])*nb
+        for n in range(len(self.start) - 1):
+            for k in range(self.start[n], self.start[n+1]):
+                self.unmarked[self.pboard[k]] += n
+        self.scores = { }       # by board, in order of winning
+
+    # returns boards completed by this number, with their scores
+    def draw(self, n):
+        start, pboard, pbit = self.start, self.pboard, self.pbit
+        marks, unmarked, scores = self.marks, self.unmarked, self.scores
+        won = [ ]
+        if not 0 <= n < len(start) - 1:
+            return won          # not on any board
+        for k in range(start[n], start[n+1]):
+            if (b := pboard[k]) in scores or marks[b] >> (i := pbit[k]) & 1:
+                continue        # already won, or number drawn before
+            m = marks[b] = marks[b] | 1 << i
+            unmarked[b] -= n
+            if m & ROW[i] == ROW[i] or m & COL[i] == COL[i]:
+                scores[b] = n * unmarked[b]
+                won.append((b, scores[b]))
+        return won
+
+    @property
+    def first(self):
+        return first(self.scores) if self.scores else None
+
+    @property
+    def last(self):
+        return last(self.scores) if self.scores else None
+
+    @property
+    def done(self):
+        return len(self.scores) == self.nboards
+
+
+# locations of each number n, as flat arrays of board and bit indices over
+# [start[n], start[n+1]), ordered by board
+def postings(boards):
+    start, pboard, pbit = array('L', [ 0 ]), array('L'), array('B')
+    for n in range(1 + max(boards, default=-1)):
+        for b,r,c in sorted(boards.get(n, ())):
+            pboard.append(b)
+            pbit.append(5*r + c)
+        start.append(len(pboard))
+    return start, pboard, pbit
+
+
+# win time of every board from the draw index (rank) of each of its numbers
+def play_np(draws, boards):
+    nb = 1 + max(b for locs in boards.values() for b,_,_ in locs)
+    nums = np.zeros((nb, 5, 5), dtype=np.int64)
+    for n, locs in boards.items():
+        for loc in locs:
+            nums[loc] = n
+
+    nd = len(draws)
+    rank = np.full(max(*draws, *boards) + 1, nd)
+    np.minimum.at(rank, draws, np.arange(nd))   # first draw of each number
+    t = rank[nums]
+    won = np.minimum(t.max(axis=2).min(axis=1), t.max(axis=1).min(axis=1))
+    unmarked = np.where(won[:,None,None] < t, nums, 0).sum(axis=(1,2))
+
+    return { int(b): draws[won[b]] * int(unmarked[b])
+             for b in np.argsort(won, kind='stable') if won[b] < nd }
+
+
+backends = { 'python': play }
+if np:
+    backends['numpy'] = play_np
 
 
 def first(map): return next(iter(map.items()))
@@ -89,6 +159,69 @@ def test2_answer(data):
     assert last(play(*read(data('input.txt')))) == (91, 30070)
 
 
+#------------------------------------------------------------------------------
+def test_postings(data):
+    draws, boards = read(data('ex0.txt'))
+    start, pboard, pbit = postings(boards)
+    assert len(start) == 27 + 1
+    assert len(pboard) == len(pbit) == 3*25
+    assert [ (pboard[k], pbit[k]) for k in range(start[7], start[8]) ] \
+        == [ (0, 14), (1, 12), (2, 24) ]
+
+def test_game(data):
+    draws, boards = read(data('ex0.txt'))
+    game = Game(boards)
+    assert game.first is None
+    assert [ game.draw(n) for n in draws[:11] ] == [ [ ] ]*11
+    assert game.draw(draws[11]) == [ (2, 4512) ]
+    assert game.first == game.last == (2, 4512)
+    assert game.draw(99) == [ ]
+    unmarked = game.unmarked[:]
+    assert game.draw(-2) == [ ]
+    assert game.unmarked == unmarked
+    for n in draws[12:]:
+        if won := game.draw(n):
+            last_won = won
+        if game.done:
+            break
+    assert last_won == [ (1, 1924) ]
+    assert game.first == (2, 4512) and game.last == (1, 1924)
+    assert n == 13
+
+def test_redraw(data):
+    draws, boards = read(data('ex0.txt'))
+    game = Game(boards)
+    for n in draws[:5]:
+        game.draw(n)
+    assert game.unmarked[0] == 264
+    assert game.draw(draws[4]) == [ ]
+    assert game.unmarked[0] == 264
+
+def test_masks():
+    assert sum(ROW[0:25:5]) == sum(COL[0:5]) == (1<<25) - 1
+    # never drawn numbers still count as unmarked
+    boards = defaultdict(set, { n: { (0, n//5, n%5) } for n in range(25) })
+    assert play(list(range(24, 19, -1)), boards) == { 0: 20 * sum(range(20)) }
+
+
+#------------------------------------------------------------------------------
+def test_numpy(data):
+    import pytest
+    pytest.importorskip('numpy')
+    for f in ('ex0.txt', 'input.txt'):
+        game = read(data(f))
+        ref, act = play(*game), play_np(*game)
+        assert act == ref
+        assert (first(act), last(act)) == (first(ref), last(ref))
+
+    # numbers drawn again only count from their first draw
+    draws, boards = read(data('ex0.txt'))
+    for redrawn in (draws[:9] + draws[4:6] + draws[9:],
+                    draws[:1]*3 + draws[1:12] + draws[2:12] + draws[12:]):
+        assert play_np(redrawn, boards) == play(redrawn, boards) \
+            == play(draws, boards)
+
+
 #------------------------------------------------------------------------------
 def test_ex0(ascript):
     assert ascript('ex0.txt') == '''\
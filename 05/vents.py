@@ -1,14 +1,43 @@
 #!/usr/bin/env python3
-from collections import Counter
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, groupby, repeat
+from math import inf
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
-        lines = read(file)
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
+        part = solve_stream(iread(file))
+        print('part[1]:', next(part))
+        print('part[2]:', next(part))
+
+
+def solve(lines, backend='python'):
+    overlaps = backends[backend]
+    yield overlaps(filter_aa(lines))
+    yield overlaps(lines)
+
 
-    print('part[1]:', count_overlaps(mark_grid_aa(lines)))
-    print('part[2]:', count_overlaps(mark_grid(lines)))
+# both parts in one pass, holding marked points (not lines):
+# axis aligned and diagonal lines are counted separately, then combined
+def solve_stream(lines):
+    aa, diag = Counter(), Counter()
+    for l in lines:
+        mark_line(aa if is_aa(l) else diag, l)
+    yield count_overlaps(aa)
+    aa.update(diag)
+    yield count_overlaps(aa)
+
+
+def overlaps(lines):
+    return count_overlaps(mark_grid(lines))
 
 
 def count_overlaps(grid):
@@ -21,17 +50,204 @@ def mark_grid_aa(lines):
 
 def mark_grid(lines):
     grid = Counter()
-    for (x,y),(x1,y1) in lines:
-        Δx,Δy = sgn(x1 - x), sgn(y1 - y)
-        while True:
-            grid[x,y] += 1
-            if x == x1 and y == y1: break
-            x,y = x+Δx, y+Δy
+    for l in lines:
+        mark_line(grid, l)
     return grid
 
 
+def mark_line(grid, line):
+    (x,y),(x1,y1) = line
+    Δx,Δy = sgn(x1 - x), sgn(y1 - y)
+    while True:
+        grid[x,y] += 1
+        if x == x1 and y == y1: break
+        x,y = x+Δx, y+Δy
+
+
+# all points of all lines generated at once, then counted by flat index
+# (relative to the bounding box, so negative coordinates index correctly)
+def overlaps_np(lines):
+    if not len(lines):
+        return 0
+    (x0, x1), (y0, y1) = np.array(lines, dtype=np.int64).reshape(-1, 2, 2).T
+    Δx, Δy = np.sign(x1 - x0), np.sign(y1 - y0)
+    n = np.maximum(abs(x1 - x0), abs(y1 - y0)) + 1
+    t = np.arange(n.sum()) - np.repeat(n.cumsum() - n, n)
+    x = np.repeat(x0, n) + np.repeat(Δx, n)*t
+    y = np.repeat(y0, n) + np.repeat(Δy, n)*t
+    x, y = x - x.min(), y - y.min()
+    return int((np.bincount(y*(x.max() + 1) + x) > 1).sum())
+
+
+backends = { 'python': overlaps }
+if np:
+    backends['numpy'] = overlaps_np
+
+
+# dense count, rasterized into a flat bytearray of counts saturating at 2
+# (1 byte per point, not a tuple and dict entry), in horizontal bands
+# of rows that may be filled by separate worker processes.  lines are moved
+# to the origin first, so the grid only spans their bounding box (and
+# negative coordinates don't wrap around)
+def overlaps_dense(lines, tiles=1, jobs=1):
+    if not lines:
+        return 0
+    x0 = min(min(xa, xb) for (xa,_),(xb,_) in lines)
+    y0 = min(min(ya, yb) for (_,ya),(_,yb) in lines)
+    if x0 or y0:
+        lines = [ ((xa-x0, ya-y0), (xb-x0, yb-y0))
+                  for (xa,ya),(xb,yb) in lines ]
+    w = 1 + max(max(x0, x1) for (x0,_),(x1,_) in lines)
+    h = 1 + max(max(y0, y1) for (_,y0),(_,y1) in lines)
+    bands = [ (h*i//tiles, h*(i+1)//tiles) for i in range(tiles) ]
+    if jobs == 1:
+        return sum(map(raster_band, repeat(lines), repeat(w), bands))
+    with ProcessPoolExecutor(jobs) as pool:
+        return sum(pool.map(raster_band, repeat(lines), repeat(w), bands))
+
+
+# count of lines covering a point, where only > 1 matters
+COVER = bytes([ 1 ] + [ 2 ]*255)
+
+def raster_band(lines, w, band):
+    y0, y1 = band
+    grid = bytearray(w*(y1 - y0))
+    for l in lines:
+        # every line is a strided slice of the grid (going down or right)
+        (xa,ya),(xb,yb) = sorted(l, key=lambda p: (p[1], p[0]))
+        Δx = sgn(xb - xa)
+        n = max(abs(xb - xa), yb - ya) + 1
+        if yb > ya:
+            skip, n = max(0, y0 - ya), min(n, y1 - ya)
+        elif y0 <= ya < y1:
+            skip = 0
+        else:
+            continue
+        if n > skip:
+            step = (yb > ya)*w + Δx
+            i = (ya + skip - y0)*w + xa + skip*Δx
+            s = slice(i, i + (n - skip - 1)*step + 1, step or 1)
+            grid[s] = grid[s].translate(COVER)
+    return len(grid) - grid.count(0) - grid.count(1)
+
+
+# analytic count, without rasterizing: every line is on a family of parallel
+# lines a*x + b*y = key, at some position t along it.  collinear overlaps
+# are found by sweeping intervals of t per key, and crossings of different
+# families are solved only for keys within range of each segment
+FAMILIES = (
+    (0, 1),     # horizontal, t = x
+    (1, 0),     # vertical, t = y
+    (1, -1),    # diagonal, t = x
+    (1, 1),     # anti-diagonal, t = x
+)
+
+
+def overlaps_sweep(lines):
+    spans = [ defaultdict(list) for _ in FAMILIES ]
+    for l in lines:
+        f, k, t0, t1 = classify(l)
+        spans[f][k].append((t0, t1))
+
+    union, multi = [ ], [ ]
+    for fam in spans:
+        union.append({ k: sweep(s, 1) for k,s in fam.items() })
+        multi.append({ k: sweep(s, 2) for k,s in fam.items() })
+    n = sum(t1 - t0 + 1 for fam in multi
+            for spans in fam.values() for t0,t1 in spans)
+
+    # points of ≥2 families are counted once for each family where they
+    # overlap already, so correct to exactly once
+    for p in crossings(union):
+        n += 1 - sum(covers(fam, f, p) for f,fam in enumerate(multi))
+    return n
+
+
+def classify(line):
+    (x0,y0),(x1,y1) = line
+    if y0 == y1:
+        f = 0
+    elif x0 == x1:
+        f = 1
+    else:
+        f = 2 if (x1 - x0 > 0) == (y1 - y0 > 0) else 3
+    a, b = FAMILIES[f]
+    t0, t1 = position(f, x0, y0), position(f, x1, y1)
+    return f, a*x0 + b*y0, min(t0, t1), max(t0, t1)
+
+
+def position(f, x, y):
+    return y if f == 1 else x
+
+
+# merged (inclusive) intervals of t covered by at least depth spans
+def sweep(spans, depth):
+    events = sorted([ (t0, 1) for t0,_ in spans ] +
+                    [ (t1+1, -1) for _,t1 in spans ])
+    out, d = [ ], 0
+    for t, evs in groupby(events, key=lambda e: e[0]):
+        was = d >= depth
+        d += sum(Δ for _,Δ in evs)
+        if not was and d >= depth:
+            t0 = t
+        elif was and d < depth:
+            if out and out[-1][1] == t0 - 1:
+                t0 = out.pop()[0]
+            out.append((t0, t - 1))
+    return out
+
+
+def covers(fam, f, p):
+    x, y = p
+    a, b = FAMILIES[f]
+    if not (spans := fam.get(a*x + b*y)):
+        return False
+    t = position(f, x, y)
+    i = bisect_right(spans, (t, inf)) - 1
+    return i >= 0 and spans[i][0] <= t <= spans[i][1]
+
+
+def crossings(union):
+    points = set()
+    for f, g in combinations(range(len(FAMILIES)), 2):
+        keys = sorted(union[g])
+        a, b = FAMILIES[g]
+        for k, spans in union[f].items():
+            for t0, t1 in spans:
+                # key of g is linear along the segment: check keys in range
+                ks = [ a*x + b*y for x,y in (point(f, k, t0),
+                                             point(f, k, t1)) ]
+                for m in keys[bisect_left(keys, min(ks)) :
+                              bisect_right(keys, max(ks))]:
+                    if (p := meet(f, k, g, m)) \
+                            and t0 <= position(f, *p) <= t1 \
+                            and covers(union[g], g, p):
+                        points.add(p)
+    return points
+
+
+def point(f, k, t):
+    a, b = FAMILIES[f]
+    return (t, (k - a*t)//b) if b else (k, t)
+
+
+# integer intersection of lines from families f and g (or None)
+def meet(f, k, g, m):
+    (a, b), (c, d) = FAMILIES[f], FAMILIES[g]
+    det = a*d - b*c
+    x, rx = divmod(k*d - b*m, det)
+    y, ry = divmod(a*m - k*c, det)
+    if not rx and not ry:
+        return x, y
+
+
 def filter_aa(lines):
-    return [ l for l in lines if l[0][0] == l[1][0] or l[0][1] == l[1][1] ]
+    return [ l for l in lines if is_aa(l) ]
+
+
+def is_aa(line):
+    (x0,y0),(x1,y1) = line
+    return x0 == x1 or y0 == y1
 
 
 def sgn(x):
@@ -41,9 +257,13 @@ def sgn(x):
 
 
 def read(file):
-    return [ tuple(tuple((int(c) for c in s.split(',')))
-                   for s in l.split(' -> '))
-             for l in file ]
+    return list(iread(file))
+
+
+def iread(file):
+    return (tuple(tuple((int(c) for c in s.split(',')))
+                  for s in l.split(' -> '))
+            for l in file)
 
 
 if __name__ == '__main__':
@@ -75,6 +295,74 @@ def test2_answer(data):
 
 
 #------------------------------------------------------------------------------
+def test_numpy(data):
+    import pytest
+    pytest.importorskip('numpy')
+    for f in ('ex0.txt', 'input.txt'):
+        lines = read(data(f))
+        for l in (lines, filter_aa(lines)):
+            assert overlaps_np(l) == overlaps(l)
+    assert overlaps_np([ ]) == 0
+    lines = [ ((-3, -1), (2, 4)), ((-3, 4), (2, -1)), ((-1, -5), (-1, 3)) ]
+    assert overlaps_np(lines) == overlaps(lines) == 2
+
+    from random import Random
+    rng = Random(5)
+    for _ in range(100):
+        lines = [ ((x0, y0), (x0 + d*dx, y0 + d*dy))
+                  for _ in range(rng.randrange(1, 8))
+                  for x0, y0, d in [ rng.choices(range(-6, 6), k=3) ]
+                  for dx, dy in [ rng.choice(((1,0), (0,1), (1,1), (1,-1))) ] ]
+        assert overlaps_np(lines) == overlaps(lines)
+
+
+#------------------------------------------------------------------------------
+def test_stream(data):
+    for f in ('ex0.txt', 'input.txt'):
+        assert list(solve_stream(iread(data(f)))) \
+            == list(solve(read(data(f))))
+
+def test_sweep(data):
+    for f in ('ex0.txt', 'input.txt'):
+        lines = read(data(f))
+        for l in (lines, filter_aa(lines)):
+            assert overlaps_sweep(l) == overlaps(l)
+
+    # brute force on small random lines, dense enough to overlap a lot
+    from random import Random
+    rng = Random(5)
+    for _ in range(50):
+        lines = [ ]
+        for _ in range(12):
+            x0, y0, n = rng.randrange(8), rng.randrange(8), rng.randrange(6)
+            Δx, Δy = rng.choice(((1,0), (0,1), (1,1), (1,-1), (-1,1)))
+            lines.append(((x0, y0), (x0 + n*Δx, y0 + n*Δy)))
+        assert overlaps_sweep(lines) == overlaps(lines)
+
+    spans = [ (0, 5), (3, 9), (6, 7), (20, 20) ]
+    assert sweep(spans, 1) == [ (0, 9), (20, 20) ]
+    assert sweep(spans, 2) == [ (3, 7) ]
+
+def test_dense(data):
+    for f in ('ex0.txt', 'input.txt'):
+        lines = read(data(f))
+        exp = overlaps(lines)
+        assert overlaps_dense(lines) == exp
+        assert overlaps_dense(lines, tiles=7) == exp
+        assert overlaps_dense(filter_aa(lines), tiles=3, jobs=2) \
+            == overlaps(filter_aa(lines))
+    assert overlaps_dense([ ((2, 2), (2, 2)), ((0, 2), (3, 2)) ], 3) == 1
+    assert overlaps_dense([ ]) == 0
+    assert overlaps_dense([ ((1, 1), (1, 1)) ]*70000) == 1
+    lines = [ ((-3, -1), (2, 4)), ((-3, 4), (2, -1)), ((-1, -5), (-1, 3)) ]
+    assert overlaps_dense(lines, tiles=2) == overlaps(lines) == 2
+
+def test_huge():
+    m = 10**7
+    lines = [ ((0, 0), (m, m)), ((0, m), (m, 0)), ((0, 5), (m, 5)),
+              ((m//2, 0), (m//2, m)), ((1, 1), (m-1, m-1)) ]
+    assert overlaps_sweep(lines) == (m-1) + 2
+
 def test_ex0(ascript):
     assert ascript('ex0.txt') == '''\
 part[1]: 5
@@ -82,7 +370,7 @@ part[2]: 12
 '''
 
 def test_input(ascript):
-    assert ascript('input.txt') == '''\
+    assert ascript('input.txt', stdin=True) == '''\
 part[1]: 6687
 part[2]: 19851
 '''
@@ -1,16 +1,25 @@
 #!/usr/bin/env python3
+from functools import cache
+from operator import mul
+
 RESET = 6
 INIT = 8
 N = INIT+1
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
         hist = read(file)
 
-    print('part[1]:', sum(run(hist, range(80))))
-    print('part[2]:', sum(run(hist, range(80, 256))))
+    part = solve(hist)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
+
+def solve(hist):
+    yield sum(run(hist, range(80)))
+    yield sum(run(hist, range(80, 256)))
 
 
 def run(hist, r):
@@ -23,6 +32,59 @@ def step(hist, i):
     hist[(RESET+1+i)%N] += hist[i%N]
 
 
+# population after any number of days as M**days applied to the histogram,
+# with M the (9x9) linear map of one day.  powers M**(2**k) are cached
+# (per modulus), so each query costs one vector-matrix product per set bit
+def population(hist, days, mod=None):
+    return dot(contribution(days, mod), hist, mod)
+
+
+# populations of many histograms (rows) at many horizons (columns), as dot
+# products with the descendants of each initial timer for each horizon
+def populations(hists, days, mod=None):
+    cs = [ contribution(d, mod) for d in days ]
+    return [ [ dot(c, h, mod) for c in cs ] for h in hists ]
+
+
+# population descended from one fish of each timer, ie sums of columns
+@cache
+def contribution(days, mod=None):
+    c = (1,)*N
+    for k in range(days.bit_length()):
+        if days >> k & 1:
+            c = vecmat(c, square(k, mod), mod)
+    return c
+
+
+@cache
+def square(k, mod=None):
+    if k:
+        m = square(k-1, mod)
+        return matmul(m, m, mod)
+    # day: every timer counts down, 0s reset and spawn a new fish
+    return tuple(tuple(int(j == i+1 or j == 0 and i in (RESET, INIT))
+                       for j in range(N))
+                 for i in range(N))
+
+
+def matmul(a, b, mod=None):
+    bt = tuple(zip(*b))
+    return tuple(tuple(reduce_mod(sum(map(mul, r, c)), mod) for c in bt)
+                 for r in a)
+
+
+def vecmat(v, m, mod=None):
+    return tuple(dot(v, c, mod) for c in zip(*m))
+
+
+def dot(u, v, mod=None):
+    return reduce_mod(sum(map(mul, u, v)), mod)
+
+
+def reduce_mod(x, mod):
+    return x % mod if mod else x
+
+
 def read(file):
     hist = [ 0 for _ in range(N) ]
     for s in file.read().split(','):
@@ -56,6 +118,32 @@ def test2_answer(data):
     assert sum(run(read(data('input.txt')), range(256))) == 1589590444365
 
 
+#------------------------------------------------------------------------------
+def test_population(data):
+    hist = read(data('input.txt'))
+    assert population(hist, 80) == 349549
+    assert population(hist, 256) == 1589590444365
+    for n in (0, 1, 17, 1000):
+        assert population(hist, n) == sum(run(list(hist), range(n)))
+        p = 1_000_007
+        assert population(hist, n, p) == population(hist, n) % p
+
+    # NB vast exact populations are big ints, but modular stays bounded
+    assert population(hist, 10**12, 2**61 - 1) < 2**61
+    assert population(hist, 10**4).bit_length() > 1000
+
+def test_populations(data):
+    hists = [ read(data('ex0.txt')), read(data('input.txt')), [ 0 ]*N,
+              [ int(t == 3) for t in range(N) ] ]
+    days = [ 0, 18, 80, 256 ]
+    pops = populations(hists, days)
+    assert pops[0] == [ 5, 26, 5934, 26984457539 ]
+    assert pops == [ [ sum(run(list(h), range(d))) for d in days ]
+                     for h in hists ]
+    assert populations(hists[:2], [ 10**9 ], 97) \
+        == [ [ population(h, 10**9, 97) ] for h in hists[:2] ]
+
+
 #------------------------------------------------------------------------------
 def test_ex0(ascript):
     assert ascript('ex0.txt') == '''\
@@ -1,14 +1,22 @@
 #!/usr/bin/env python3
-from statistics import mean, median_low
+from itertools import accumulate
+from operator import mul
+from random import Random
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
         src = read(file)
 
-    print('part[1]:', cost1(src, best_pos1(src)))
-    print('part[2]:', cost2(src, best_pos2(src)))
+    part = solve(src)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
+
+def solve(src):
+    yield cost1(src, best_pos1(src))
+    yield cost2(src, best_pos2(src))
 
 
 def cost1(src, dst):
@@ -20,12 +28,83 @@ def cost2(src, dst):
 
 
 def best_pos1(src):
-    return median_low(src)
+    return select(src, (len(src) - 1)//2)     # low median
 
 
 def best_pos2(src):
-    p0 = int(mean(src))
-    return p0 if cost2(src, p0) < cost2(src, p0+1) else p0+1
+    costs = Costs(src)
+    return argmin_convex(costs.cost2, costs.lo, costs.hi)
+
+
+# best position for any fuel per distance that is convex and nondecreasing,
+# which makes the total cost convex in the position too
+def best_pos(src, fuel):
+    return argmin_convex(lambda dst: sum(fuel(abs(dst - p)) for p in src),
+                         min(src), max(src))
+
+
+# k-th smallest in expected linear time: quickselect with 3 way partitions
+# (by comprehension, which beats swapping in place in Python)
+def select(xs, k):
+    rng = Random(len(xs))
+    while True:
+        pivot = xs[rng.randrange(len(xs))]
+        lt = [ x for x in xs if x < pivot ]
+        if k < len(lt):
+            xs = lt
+            continue
+        k -= len(lt) + xs.count(pivot)
+        if k < 0:
+            return pivot
+        xs = [ x for x in xs if x > pivot ]
+
+
+# lowest minimizer of convex f over integers [lo, hi]: binary search for
+# the first point where f stops decreasing (exact, even with plateaus)
+def argmin_convex(f, lo, hi):
+    while lo < hi:
+        mid = (lo + hi)//2
+        if f(mid) <= f(mid + 1):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+# cost of any position in O(1), from prefix sums over a histogram of crab
+# positions: of counts and positions for crabs left of the position (to
+# split distances by sign), and totals of positions and squares for cost2
+class Costs:
+    def __init__(self, src):
+        self.lo, self.hi = lo, hi = min(src), max(src)
+        hist = [ 0 ]*(hi - lo + 1)
+        for p in src:
+            hist[p - lo] += 1
+        pos = range(lo, hi+1)
+        self.count = list(accumulate(hist, initial=0))
+        self.sum = list(accumulate(map(mul, hist, pos), initial=0))
+        self.sumsq = sum(map(mul, hist, (p*p for p in pos)))
+
+    @property
+    def positions(self):
+        return range(self.lo, self.hi+1)
+
+    def cost1(self, dst):
+        i = min(max(dst - self.lo + 1, 0), len(self.count) - 1)
+        n, s = self.count[-1], self.sum[-1]
+        nl, sl = self.count[i], self.sum[i]
+        return dst*nl - sl + (s - sl) - dst*(n - nl)
+
+    # Σ Δ(Δ+1)/2 = (Σ Δ² + Σ Δ)/2, where Σ Δ² needs no split by sign
+    def cost2(self, dst):
+        n, s = self.count[-1], self.sum[-1]
+        return (n*dst*dst - 2*dst*s + self.sumsq + self.cost1(dst))//2
+
+    def costs1(self):
+        return [ self.cost1(p) for p in self.positions ]
+
+    def costs2(self):
+        return [ self.cost2(p) for p in self.positions ]
 
 
 def read(file):
@@ -74,6 +153,44 @@ def test2_input(data):
     assert cost2(src, best_pos2(src)) == 99266250
 
 
+#------------------------------------------------------------------------------
+def test_costs(data):
+    for f in ('ex0.txt', 'input.txt'):
+        src = read(data(f))
+        costs = Costs(src)
+        assert costs.costs1() == [ cost1(src, p) for p in costs.positions ]
+        assert costs.costs2() == [ cost2(src, p) for p in costs.positions ]
+        for p in (costs.lo - 3, costs.hi + 5):
+            assert (costs.cost1(p), costs.cost2(p)) \
+                == (cost1(src, p), cost2(src, p))
+    assert min(costs.costs1()) == 352331
+    assert min(costs.costs2()) == 99266250
+
+
+def test_select():
+    from array import array
+    rng = Random(7)
+    for n in (1, 2, 10, 1001):
+        xs = array('l', (rng.randrange(50) for _ in range(n)))
+        ref = sorted(xs)
+        assert [ select(xs, k) for k in range(0, n, max(1, n//17)) ] \
+            == ref[::max(1, n//17)]
+
+def test_argmin():
+    assert argmin_convex(lambda x: (x - 3)**2, -10, 10) == 3
+    assert argmin_convex(lambda x: max(0, abs(x) - 4), -10, 10) == -4
+    assert argmin_convex(abs, 5, 9) == 5
+    assert argmin_convex(lambda x: -x, 5, 9) == 9
+
+def test_best_pos(data):
+    src = read(data('ex0.txt'))
+    for fuel in (lambda d: d, lambda d: d*(d+1)//2, lambda d: d**3,
+                 lambda d: max(0, d - 3)):
+        def cost(dst): return sum(fuel(abs(dst - p)) for p in src)
+        lo, hi = min(src), max(src)
+        assert cost(best_pos(src, fuel)) == min(map(cost, range(lo, hi+1)))
+
+
 #------------------------------------------------------------------------------
 def test_ex0(ascript):
     assert ascript('ex0.txt') == '''\
@@ -1,46 +1,76 @@
 #!/usr/bin/env python3
-zet = frozenset
+from collections import Counter
+
+# segments lit for each digit
+DIGITS = ('abcefg', 'cf', 'acdeg', 'acdfg', 'bcdf',
+          'abdfg', 'abdefg', 'acf', 'abcdefg', 'abcdfg')
+
+BIT = { c: 1<<i for i,c in enumerate('abcdefg') }
+
+
+def mask(pat):
+    return sum(map(BIT.__getitem__, pat))
+
+
+# over all 10 patterns, each segment is lit a distinct number of times
+# (except a/c and d/g) and summing those counts over the segments of each
+# digit identifies it uniquely, independent of wiring
+def signature(pats):
+    n = Counter(c for p in pats for c in p)
+    return [ sum(n[c] for c in p) for p in pats ]
+
+SIGNATURE = { s: d for d,s in enumerate(signature(DIGITS)) }
+assert len(SIGNATURE) == 10
+
+# segment counts are kept in one byte per segment of an int (counts ≤ 10,
+# sums ≤ 70, so no carries), to count and sum with a few int operations
+SPREAD = tuple(sum(1 << 8*i for i in range(7) if p >> i & 1)
+               for p in range(1<<7))
+BYTES = 0x01_01_01_01_01_01_01
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
         notes = read(file)
 
-    print('part[1]:', unique_outputs(notes))
-    print('part[2]:', sum_outputs(notes))
+    part = solve(notes)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
+
+def solve(notes):
+    yield unique_outputs(notes)
+    yield sum_outputs(notes)
 
 
 def unique_outputs(notes):
-    return sum(int(len(p) in (2, 3, 4, 7))
+    return sum(int(p.bit_count() in (2, 3, 4, 7))
                for _,out in notes
                for p in out)
 
 
 def sum_outputs(notes):
-    return sum(encode(out, decode(inp)) for inp,out in notes)
+    return sum(output(inp, out) for inp,out in notes)
+
+
+def output(inp, out):
+    counts = sum(map(SPREAD.__getitem__, inp))
+    n = 0
+    for p in out:
+        n = 10*n + digit(counts, p)
+    return n
 
 
 def decode(inp):
-    inp = sorted(inp, key=len)
-    digs = [ None for _ in range(10) ]
-    digs[1], digs[7], digs[4], *unk, digs[8] = inp
-
-    def finddig(n, pat):
-        for i,p in enumerate(unk):
-            if len(p) == n and p >= pat:
-                del unk[i]
-                return p
-        assert None # pragma: no cover
-
-    digs[3] = finddig(5, digs[7])		# 3 = 7+dg
-    digs[5] = finddig(5, digs[4]-digs[1])	# 5 = 4-1+afg
-    digs[2] = finddig(5, zet())			# 2 = only remaining x5
-    digs[9] = finddig(6, digs[4]|digs[5])	# 9 = 5+4
-    digs[6] = finddig(6, digs[8]-digs[4]|digs[5]) # 6 = 8-4+5
-    assert len(unk) == 1
-    digs[0] = unk[0]
-    return { p:i for i,p in enumerate(digs) }
+    counts = sum(map(SPREAD.__getitem__, inp))
+    return { p: digit(counts, p) for p in inp }
+
+
+# sum the counts of segments in pattern (masking bytes then summing them
+# all into the top byte by multiplication)
+def digit(counts, pat):
+    return SIGNATURE[(counts & SPREAD[pat]*0xff) * BYTES >> 48 & 0xff]
 
 
 def encode(out, dec):
@@ -48,7 +78,7 @@ def encode(out, dec):
 
 
 def read(file):
-    return [ tuple(tuple(zet(p) for p in s.split())
+    return [ tuple(tuple(mask(p) for p in s.split())
                    for s in l.strip().split('|'))
              for l in file ]
 
@@ -84,16 +114,16 @@ def test2_ex0(data):
     inp,out = read(data('ex0.txt'))[0]
     dec = decode(inp)
     assert dec == {
-        zet('acedgfb'): 8,
-        zet('cdfbe'): 5,
-        zet('gcdfa'): 2,
-        zet('fbcad'): 3,
-        zet('dab'): 7,
-        zet('cefabd'): 9,
-        zet('cdfgeb'): 6,
-        zet('eafb'): 4,
-        zet('cagedb'): 0,
-        zet('ab'): 1,
+        mask('acedgfb'): 8,
+        mask('cdfbe'): 5,
+        mask('gcdfa'): 2,
+        mask('fbcad'): 3,
+        mask('dab'): 7,
+        mask('cefabd'): 9,
+        mask('cdfgeb'): 6,
+        mask('eafb'): 4,
+        mask('cagedb'): 0,
+        mask('ab'): 1,
     }
     assert encode(out, dec) == 5353
 
@@ -103,6 +133,12 @@ def test2_ex1(data):
 def test2_answer(data):
     assert sum_outputs(read(data('input.txt'))) == 1010472
 
+def test_signature():
+    assert sorted(SIGNATURE.values()) == list(range(10))
+    assert signature(DIGITS)[8] == 49
+    counts = sum(SPREAD[mask(p)] for p in DIGITS)
+    assert [ digit(counts, mask(p)) for p in DIGITS ] == list(range(10))
+
 
 #------------------------------------------------------------------------------
 def test_ex0(ascript):
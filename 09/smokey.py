@@ -1,20 +1,32 @@
 #!/usr/bin/env python3
-from array import array
-from itertools import chain
 from functools import reduce
 from operator import mul
+from pathlib import Path
+import sys
 
-chainit = chain.from_iterable
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.insert(1, str(Path(__file__).resolve().parents[1]))
+from aoc.grid import Grid, offsets
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
-        hmap,w = read(file)
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
+        hmap = read(file)
 
-    mins = find_mins(hmap, w)
-    print('part[1]:', risk_level(hmap, mins))
-    print('part[2]:', avoidance(fill_basins(hmap, w, mins)))
+    part = solve(hmap)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
+
+def solve(hmap, backend='python'):
+    mins = backends[backend](*hmap)
+    yield risk_level(hmap[0], mins)
+    yield avoidance(fill_basins(*hmap, mins))
 
 
 def risk_level(hmap, mins):
@@ -26,40 +38,53 @@ def avoidance(basin):
 
 
 def fill_basins(hmap, w, mins):
-    vis = array('B', (0 if h < 9 else 1 for h in hmap))
+    vis = hmap.translate(WALLS)
     return [ fill_basin(vis, w, i) for i in mins ]
 
 
+# 9s (including padding) are basin walls
+WALLS = bytes(int(h >= 9) for h in range(256))
+
+
 def fill_basin(vis, w, seed):
+    N, W, E, S = offsets(w)
     front, size = [ seed ], 0
     vis[seed] = 1
     while front:
         size += 1
         i = front.pop()
-        if not vis[j := i+w]: front.append(j); vis[j] = 1
-        if not vis[j := i+1]: front.append(j); vis[j] = 1
-        if not vis[j := i-1]: front.append(j); vis[j] = 1
-        if not vis[j := i-w]: front.append(j); vis[j] = 1
+        if not vis[j := i+S]: front.append(j); vis[j] = 1
+        if not vis[j := i+E]: front.append(j); vis[j] = 1
+        if not vis[j := i+W]: front.append(j); vis[j] = 1
+        if not vis[j := i+N]: front.append(j); vis[j] = 1
     return size
 
 
 def find_mins(hmap, w):
+    N, W, E, S = offsets(w)
     return [ i for i in range(w+1, len(hmap)-w-1)
-             if (h := hmap[i]) < hmap[i-1] and
-                h < hmap[i+1] and
-                h < hmap[i-w] and
-                h < hmap[i+w] ]
+             if (h := hmap[i]) < hmap[i+W] and
+                h < hmap[i+E] and
+                h < hmap[i+N] and
+                h < hmap[i+S] ]
 
 
-def read(file):
-    def grokrow(line):
-        return chain((9,), (int(c) for c in line.strip()), (9,))
+def find_mins_np(hmap, w):
+    g = Grid(hmap, w).view()
+    h = g[1:-1, 1:-1]
+    y, x = np.nonzero((h < g[1:-1, :-2]) & (h < g[1:-1, 2:]) &
+                      (h < g[:-2, 1:-1]) & (h < g[2:, 1:-1]))
+    return ((y+1)*w + x+1).tolist()
 
+
+backends = { 'python': find_mins }
+if np:
+    backends['numpy'] = find_mins_np
+
+
+def read(file):
     # pad to simplify boundary conditions
-    row0 = array('B', grokrow(file.readline()))
-    w = len(row0)
-    return array('B', chain(
-        (9,)*w, row0, chainit(grokrow(l) for l in file), (9,)*w)), w
+    return Grid.read(file, pad=1, fill=9)
 
 
 if __name__ == '__main__':
@@ -94,6 +119,15 @@ def test2_answer(data):
     assert avoidance(fill_basins(*hmap, find_mins(*hmap))) == 1050192
 
 
+#------------------------------------------------------------------------------
+def test_numpy(data):
+    import pytest
+    pytest.importorskip('numpy')
+    for f in ('ex0.txt', 'input.txt'):
+        hmap = read(data(f))
+        assert find_mins_np(*hmap) == find_mins(*hmap)
+
+
 #------------------------------------------------------------------------------
 def test_ex0(ascript):
     assert ascript('ex0.txt') == '''\
@@ -26,12 +26,28 @@ cpl_score = {
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
-        code = read(file)
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
+        part = solve_stream(iread(file))
+        print('part[1]:', next(part))
+        print('part[2]:', next(part))
 
-    print('part[1]:', error_score(code))
-    print('part[2]:', completion_score(code))
+
+def solve(code):
+    yield error_score(code)
+    yield completion_score(code)
+
+
+# both parts in one pass, keeping only completion scores (not lines)
+def solve_stream(code):
+    err, cpl = 0, [ ]
+    for l in code:
+        ctx, c = parse(l)
+        err += err_score[c]
+        if ctx:
+            cpl.append(_cpl_score_line(ctx))
+    yield err
+    yield median(cpl)
 
 
 def error_score(code):
@@ -60,7 +76,11 @@ def parse(line):
 
 
 def read(file):
-    return [ l.strip() for l in file ]
+    return list(iread(file))
+
+
+def iread(file):
+    return (l.strip() for l in file)
 
 
 if __name__ == '__main__':
@@ -124,6 +144,11 @@ def test2_answer(data):
 
 
 #------------------------------------------------------------------------------
+def test_stream(data):
+    for f in ('ex0.txt', 'input.txt'):
+        assert list(solve_stream(iread(data(f)))) \
+            == list(solve(read(data(f))))
+
 def test_ex0(ascript):
     assert ascript('ex0.txt') == '''\
 part[1]: 26397
@@ -131,7 +156,7 @@ part[2]: 288957
 '''
 
 def test_input(ascript):
-    assert ascript('input.txt') == '''\
+    assert ascript('input.txt', stdin=True) == '''\
 part[1]: 319329
 part[2]: 3515583998
 '''
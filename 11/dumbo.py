@@ -1,25 +1,39 @@
 #!/usr/bin/env python3
-from array import array
-from itertools import count, chain
+from itertools import count
+from pathlib import Path
+import sys
 
-chainit = chain.from_iterable
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-N8 = tuple((Δx, Δy)
-           for Δy in range(-1,1+1)
-           for Δx in range(-1,1+1)
-           if Δx or Δy)
+sys.path.insert(1, str(Path(__file__).resolve().parents[1]))
+from aoc.grid import Grid, N8, offsets
+
+# padding is never counted as flashing, so absorbs energy from the edges,
+# and is reset at the start of each step
+PAD = 0x80
+ENERGIZE = bytes(z+1 if z < PAD else PAD for z in range(256))
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
-        grid, w = read(file)
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
+        grid = read(file)
+
+    part = solve(grid)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
 
-    print('part[1]:', run(grid, w))
-    print('part[2]:', find_allflash(grid, w))
+def solve(grid, backend='python'):
+    yield run(*grid, backend=backend)
+    yield find_allflash(*grid, backend)
 
 
-def run(grid, w, steps=100):
+def run(grid, w, steps=100, backend='python'):
+    step = backends[backend]
     nflash = 0
     for _ in range(steps):
         grid, n = step(grid, w)
@@ -27,36 +41,52 @@ def run(grid, w, steps=100):
     return nflash
 
 
-def find_allflash(grid, w):
+def find_allflash(grid, w, backend='python'):
+    step = backends[backend]
+    size = len(grid) - grid.count(PAD)
     for i in count(1):  # pragma: no branch
         grid, n = step(grid, w)
-        if n == len(grid):
+        if n == size:
             return i
 
 
 def step(grid, w):
-    grid = array('B', (z+1 for z in grid))
+    grid = grid.translate(ENERGIZE)
+    nbrs = offsets(w, N8)
     nflash = 0
-    while flash := [ i for i,z in enumerate(grid) if z > 9 ]:
+    while flash := [ i for i,z in enumerate(grid) if 9 < z < PAD ]:
         nflash += len(flash)
         for i0 in flash:
             grid[i0] = 0
-            x0,y0 = i0%w, i0//w
-            for Δx,Δy in N8:
-                x,y = x0+Δx, y0+Δy
-                if 0 <= x < w and 0 <= y < w and grid[i := w*y + x]:
+            for Δ in nbrs:
+                if grid[i := i0+Δ]:
                     grid[i] += 1
     return grid, nflash
 
 
-def read(file):
-    row0 = array('B', parse_row(file.readline()))
-    w = len(row0)
-    return array('B', chain(row0, chainit(parse_row(l) for l in file))), w
+def step_np(grid, w):
+    z = Grid(grid, w).view()[1:-1, 1:-1] + 1
+    h, n = z.shape
+    flashed = np.zeros_like(z, dtype=bool)
+    while (new := (z > 9) & ~flashed).any():
+        flashed |= new
+        new = np.pad(new, 1)
+        for Δx,Δy in N8:
+            z += new[1+Δy : 1+Δy+h, 1+Δx : 1+Δx+n]
+    z[flashed] = 0
+
+    dst = np.full((h+2, n+2), PAD, dtype=np.uint8)
+    dst[1:-1, 1:-1] = z
+    return bytearray(dst), int(flashed.sum())
 
 
-def parse_row(line):
-    return (int(c) for c in line.strip())
+backends = { 'python': step }
+if np:
+    backends['numpy'] = step_np
+
+
+def read(file):
+    return Grid.read(file, pad=1, fill=PAD)
 
 
 if __name__ == '__main__':
@@ -90,6 +120,20 @@ def test2_answer(data):
     assert find_allflash(*read(data('input.txt'))) == 256
 
 
+#------------------------------------------------------------------------------
+def test_numpy(data):
+    import pytest
+    pytest.importorskip('numpy')
+    grid, w = read(data('input.txt'))
+    for _ in range(20):
+        ref, n = step(grid, w)
+        act, m = step_np(grid, w)
+        # NB padding may differ, only reset at next step
+        assert m == n and Grid(act, w).cropped() == Grid(ref, w).cropped()
+        grid = ref
+    assert list(solve(read(data('ex0.txt')), 'numpy')) == [ 1656, 195 ]
+
+
 #------------------------------------------------------------------------------
 def test_ex0(ascript):
     assert ascript('ex0.txt') == '''\
@@ -4,12 +4,18 @@ from collections import defaultdict
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
         adj = read(file)
 
-    print('part[1]:', count_paths(adj))
-    print('part[2]:', count_paths(adj, revisit1=True))
+    part = solve(adj)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
+
+def solve(adj):
+    yield count_paths(adj)
+    yield count_paths(adj, revisit1=True)
 
 
 def count_paths(adj, revisit1=False):
@@ -5,17 +5,28 @@ zet = frozenset
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
         dots, folds = read(file)
 
-    print('part[1]:', len(fold(dots, *folds[0])))
-
-    dots = fold_all(dots, folds)
-    print('part[2]:', len(dots))
+    part = folded((dots, folds))
+    print('part[1]:', len(next(part)))
+    print('part[2]:', len(dots := next(part)))
     dump(dots)
 
 
+def solve(sheet):
+    yield from map(len, folded(sheet))
+
+
+# dots after the first fold, then after all of them
+def folded(sheet):
+    dots, folds = sheet
+    dots = fold(dots, *folds[0])
+    yield dots
+    yield fold_all(dots, folds[1:])
+
+
 def fold_all(dots, folds):
     for f in folds:
         dots = fold(dots, *f)
@@ -48,6 +59,8 @@ def aabb(dots):
     return (x0,y0),(x1,y1)
 
 
+# dots are collected straight from the stream (without a list of lines),
+# since they are all needed by the first fold
 def read(file):
     return zet(read_dots(file)), [ parse_fold(l) for l in file ]
 
@@ -101,7 +114,7 @@ part[2]: 16
 '''
 
 def test_input(ascript):
-    assert ascript('input.txt') == '''\
+    assert ascript('input.txt', stdin=True) == '''\
 part[1]: 716
 part[2]: 97
     ███  ███   ██  █  █ ████ ███  █    ███ 
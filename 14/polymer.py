@@ -4,12 +4,18 @@ from collections import Counter
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
-        seed, rules = read(file)
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
+        poly = read(file)
 
-    print('part[1]:', runchk(seed, rules, 10))
-    print('part[2]:', runchk(seed, rules, 40))
+    part = solve(poly)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
+
+def solve(poly):
+    yield runchk(*poly, 10)
+    yield runchk(*poly, 40)
 
 
 def runchk(seed, rules, n):
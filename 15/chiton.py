@@ -1,62 +1,64 @@
 #!/usr/bin/env python3
 from array import array
-from itertools import count, chain
+from itertools import count
 from functools import partial
 from collections import defaultdict
+from pathlib import Path
+import sys
 
-chainit = chain.from_iterable
-
-N4 = ((0,-1), (-1,0), (1,0), (0,1))
+sys.path.insert(1, str(Path(__file__).resolve().parents[1]))
+from aoc.grid import Grid, offsets
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
-        map, w = read(file)
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
+        map = read(file)
+
+    part = solve(map)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
 
-    print('part[1]:', sssp(map, w)[-1])
-    print('part[2]:', sssp(*tile_map(map, w))[-1])
+def solve(map):
+    yield sssp(*map)[-1]
+    yield sssp(*tile_map(*map))[-1]
 
 
 def tile_map(src, w, n=5, m=5):
     h = len(src) // w
-    return bytes(
+    return Grid(bytearray(
         (src[y*w + x] + i+j - 1)%9 + 1
         for j in range(m) for y in range(h)
         for i in range(n) for x in range(w)
-    ), n*w
+    ), n*w)
 
 
 def sssp(cost, w):
-    h = len(cost) // w
-    dist = array('L', ((1<<32)-1 for _ in range(len(cost))))
+    # pad with 0 distance, which can never be improved,
+    # so neighbors need no bounds checks
+    cost, w = Grid(cost, w).padded()
+    dist = array('L', ((1<<32)-1 if c else 0 for c in cost))
     queues = defaultdict(partial(array, 'L'))
+    nbrs = offsets(w)
 
-    dist[0] = 0
-    queues[0].append(0)
+    dist[w+1] = 0
+    queues[0].append(w+1)
     idp = count()
 
     while queues:
         for i0 in queues.pop(next(idp), ()):
-            d0, x0,y0 = dist[i0], i0%w, i0//w
-            for Δx,Δy in N4:
-                x,y = x0+Δx, y0+Δy
-                i = w*y + x
-                if 0 <= x < w and 0 <= y < h and dist[i] > (d := d0 + cost[i]):
+            d0 = dist[i0]
+            for Δ in nbrs:
+                if dist[i := i0+Δ] > (d := d0 + cost[i]):
                     dist[i] = d
                     queues[d].append(i)
 
-    return dist
+    return Grid(dist, w).cropped().cells
 
 
 def read(file):
-    row0 = bytes(parse_row(file.readline()))
-    w = len(row0)
-    return bytes(chain(row0, chainit(parse_row(l) for l in file))), w
-
-
-def parse_row(line):
-    return (int(c) for c in line.strip())
+    return Grid.read(file)
 
 
 if __name__ == '__main__':
@@ -47,12 +47,19 @@ class Packet(namedtuple('Packet', 'ver type val')):
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
-        pkt = Packet.read(file)
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
+        bits = read(file)
 
-    print('part[1]:', pkt.sum_versions())
-    print('part[2]:', pkt.evaluate())
+    part = solve(bits)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
+
+def solve(bits):
+    pkt = parse_packet(bits)[1]
+    yield pkt.sum_versions()
+    yield pkt.evaluate()
 
 
 def parse_packet(bits):
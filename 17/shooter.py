@@ -3,12 +3,18 @@ from math import inf, ceil, floor, sqrt
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
         tgt = read(file)
 
-    print('part[1]:', maxheight(calc_Δy0max(tgt)))
-    print('part[2]:', ilen(all_trajectories(tgt)))
+    part = solve(tgt)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
+
+def solve(tgt):
+    yield maxheight(calc_Δy0max(tgt))
+    yield ilen(all_trajectories(tgt))
 
 
 def maxheight(Δy0):
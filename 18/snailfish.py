@@ -4,12 +4,18 @@ import re
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
         vals = read(file)
 
-    print('part[1]:', sum(vals).magnitude())
-    print('part[2]:', max_pairsum(vals))
+    part = solve(vals)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
+
+def solve(vals):
+    yield sum(vals).magnitude()
+    yield max_pairsum(vals)
 
 
 def max_pairsum(vals):
@@ -7,13 +7,19 @@ chainit = chain.from_iterable
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
         scns = read(file)
 
+    part = solve(scns)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
+
+def solve(scns):
     pos = locate_scanners(scns)
-    print('part[1]:', count_unique(scns))
-    print('part[2]:', max_dist1(pos))
+    yield count_unique(scns)
+    yield max_dist1(pos)
 
 
 def count_unique(it):
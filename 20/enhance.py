@@ -1,19 +1,37 @@
 #!/usr/bin/env python3
 from itertools import count, repeat, chain
+from pathlib import Path
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.insert(1, str(Path(__file__).resolve().parents[1]))
+from aoc.grid import Grid, PIXELS, parse_row
 
 chainit = chain.from_iterable
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
-        filt, img = read(file)
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
+        scan = read(file)
+
+    part = solve(scan)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
 
+def solve(scan, backend='python'):
+    enhance = backends[backend]
+    filt, img = scan
     img = enhance(filt, img, 2)
-    print('part[1]:', img.count())
+    yield img.count()
 
     img = enhance(filt, img, 50-2)
-    print('part[2]:', img.count())
+    yield img.count()
 
 
 def enhance(filter, img, n):
@@ -60,14 +78,31 @@ class Image:
         return Image(dst, filter[-1 if bg else 0])
 
 
-def read(file):
-    filter = parse_line(file.readline())
-    file.readline()
-    return filter, Image([ parse_line(l) for l in file ])
+# whole image as one array, every window index computed by shifted slices
+def enhance_np(filter, img, n):
+    filt = np.frombuffer(filter, dtype=np.uint8)
+    pix = np.frombuffer(b''.join(img.pix), dtype=np.uint8)
+    pix, bg = pix.reshape(len(img.pix), -1), img.bg
+    for _ in range(n):
+        src = np.pad(pix, 2, constant_values=bg).astype(np.uint16)
+        h, w = src.shape[0] - 2, src.shape[1] - 2
+        i = np.zeros((h, w), dtype=np.uint16)
+        for y in range(3):
+            for x in range(3):
+                i = i<<1 | src[y:y+h, x:x+w]
+        pix, bg = filt[i], filter[-1 if bg else 0]
+    return Image([ bytearray(r) for r in pix ], bg)
 
 
-def parse_line(line):
-    return bytes(int(c == '#') for c in line.strip())
+backends = { 'python': enhance }
+if np:
+    backends['numpy'] = enhance_np
+
+
+def read(file):
+    filter = parse_row(file.readline(), PIXELS)
+    file.readline()
+    return filter, Image(Grid.read(file, PIXELS).rows())
 
 
 if __name__ == '__main__':
@@ -94,6 +129,16 @@ def test2_answer(data):
     assert enhance(*read(data('input.txt')), 50).count() == 17917
 
 
+#------------------------------------------------------------------------------
+def test_numpy(data):
+    import pytest
+    pytest.importorskip('numpy')
+    filt, img = read(data('input.txt'))
+    for n in (1, 2, 5):
+        ref, act = enhance(filt, img, n), enhance_np(filt, img, n)
+        assert (act.pix, act.bg) == (ref.pix, ref.bg)
+
+
 #------------------------------------------------------------------------------
 def test_ex0(ascript):
     assert ascript('ex0.txt') == '''\
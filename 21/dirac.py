@@ -4,12 +4,18 @@ from collections import Counter
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
         start = read(file)
 
-    print('part[1]:', practice(start))
-    print('part[2]:', max(count_wins(start)))
+    part = solve(start)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
+
+def solve(start):
+    yield practice(start)
+    yield max(count_wins(start))
 
 
 def count_wins(start):
@@ -5,12 +5,18 @@ from operator import mul
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
         steps = read(file)
 
-    print('part[1]:', popcount(initialize(steps)))
-    print('part[2]:', popcount(reboot(steps)))
+    part = solve(steps)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
+
+def solve(steps):
+    yield popcount(initialize(steps))
+    yield popcount(reboot(steps))
 
 
 def initialize(steps):
@@ -5,12 +5,18 @@ from heapq import heappush, heappop
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
         init = read(file)
 
-    print('part[1]:', search(init))
-    print('part[2]:', search(unfold(*init)))
+    part = solve(init)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
+
+def solve(init):
+    yield search(init)
+    yield search(unfold(*init))
 
 
 part2_extra = '''\
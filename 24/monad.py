@@ -4,14 +4,19 @@ import re
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
         digs = read(file)
 
-    pairs = match_pairs(digs)
+    part = solve(digs)
+    print('part[1]:', next(part))
+    print('part[2]:', next(part))
+
 
-    print('part[1]:', extremum(digs, pairs, max))
-    print('part[2]:', extremum(digs, pairs, min))
+def solve(digs):
+    pairs = match_pairs(digs)
+    yield extremum(digs, pairs, max)
+    yield extremum(digs, pairs, min)
 
 
 def extremum(digs, pairs, sel):
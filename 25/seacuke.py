@@ -1,13 +1,25 @@
 #!/usr/bin/env python3
 from itertools import count, chain
+from pathlib import Path
+import sys
+
+sys.path.insert(1, str(Path(__file__).resolve().parents[1]))
+from aoc.grid import Grid
+
+EMPTY, EAST, SOUTH = range(3)
+HERDS = bytes.maketrans(b'.>v', bytes((EMPTY, EAST, SOUTH)))
 
 
 def main():
-    from sys import argv
-    with open(argv[1]) as file:
+    from sys import argv, stdin
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
         herds = read(file)
 
-    print(run_fixed(*herds))
+    print(*solve(herds))
+
+
+def solve(herds):
+    yield run_fixed(*herds)
 
 
 def run_fixed(*prev):
@@ -43,20 +55,9 @@ def move_S(he, hs, w):
 
 
 def read(file):
-    he, hs = [ ], [ ]
-    for line in file:
-        re, rs, w = parse_row(line.strip())
-        he.append(re)
-        hs.append(rs)
-
-    return he, hs, w
-
-
-def parse_row(row):
     # separate bit masks >32x faster than merged bytes w/generic move
-    return (sum(1<<x for x,c in enumerate(row) if c == '>'),
-            sum(1<<x for x,c in enumerate(row) if c == 'v'),
-            len(row))
+    grid = Grid.read(file, HERDS)
+    return grid.masks(EAST), grid.masks(SOUTH), grid.w
 
 
 if __name__ == '__main__':
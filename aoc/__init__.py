@@ -0,0 +1 @@
+# shared harness for running the daily solution scripts in-process
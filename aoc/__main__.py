@@ -0,0 +1,240 @@
+import argparse, importlib.util, sys
+
+from . import baseline, bench, days, profiling, runner
+from .cache import Cache
+
+
+def main(args=None):
+    opts = parser().parse_args(args)
+    return opts.cmd(opts)
+
+
+def parser():
+    p = argparse.ArgumentParser(
+        prog='python -m aoc',
+        description='run daily solutions in a single process')
+    sub = p.add_subparsers(required=True)
+
+    run = sub.add_parser('run', help='solve and report timing per stage')
+    run.set_defaults(cmd=cmd_run)
+    add_days(run)
+    add_input(run)
+    run.add_argument('--no-mem', dest='mem', action='store_false',
+                     help='skip (slower) allocation tracing pass')
+    run.add_argument('-j', '--jobs', type=int, default=1,
+                     help='worker processes to run days in parallel '
+                          '(0 for one per CPU)')
+    add_cache(run)
+    prof = run.add_mutually_exclusive_group()
+    prof.add_argument('--profile', nargs='?', const='prof', metavar='DIR',
+                      help='run each stage under cProfile, '
+                           'saving .prof files to DIR (default: prof)')
+    prof.add_argument('--memprofile', nargs='?', const='prof', metavar='DIR',
+                      help='trace allocations of each stage, '
+                           'saving snapshots to DIR (default: prof)')
+    run.add_argument('--top', type=int, default=10,
+                     help='number of hot spots listed per stage (default: 10)')
+    run.add_argument('--backend', choices=('python', 'numpy'),
+                     default='python',
+                     help='implementation of hot loops, for days that have '
+                          'alternatives (default: python)')
+
+    b = sub.add_parser('bench', help='time solutions over scaled inputs')
+    b.set_defaults(cmd=cmd_bench)
+    add_days(b)
+    b.add_argument('-s', '--scales', default='1,10', type=parse_scales,
+                   help='input sizes relative to puzzle input (default: 1,10)')
+    b.add_argument('--seed', type=int, default=0,
+                   help='random seed for input generators')
+    b.add_argument('-r', '--repeat', type=int, default=1,
+                   help='repetitions per input (best time is kept)')
+    b.add_argument('-t', '--threshold', type=float, default=1.25,
+                   help='flag growth order above this (default: 1.25)')
+    b.add_argument('--csv', help='also save all measurements to file')
+    add_cache(b)
+
+    base = sub.add_parser('baseline', help='save timing baseline')
+    base.set_defaults(cmd=cmd_baseline)
+    add_days(base)
+    add_input(base)
+    add_baseline(base)
+
+    cmp = sub.add_parser('compare', help='check timing against baseline')
+    cmp.set_defaults(cmd=cmd_compare)
+    add_days(cmp)
+    add_baseline(cmp)
+    cmp.add_argument('-t', '--threshold', type=float, default=0.2,
+                     help='flag stages slower than baseline by this fraction '
+                          '(default: 0.2)')
+    cmp.add_argument('--floor', type=float, default=1e-3,
+                     help='ignore slow downs smaller than this many seconds '
+                          '(default: 0.001)')
+
+    return p
+
+
+def parse_scales(s):
+    return [ float(u) for u in s.split(',') ]
+
+
+def add_days(p):
+    p.add_argument('days', nargs='?', default='all', type=days.parse_days,
+                   help='days to run, eg: 1,3,5-9 (default: all)')
+
+
+def add_input(p):
+    p.add_argument('-i', '--input', default='input.txt',
+                   help='input file name in each day directory')
+
+
+def add_cache(p):
+    p.add_argument('--cache', nargs='?', const=True, metavar='DIR',
+                   help='load parsed inputs from cache (default: .cache)')
+
+
+def cache(opts):
+    if opts.cache is True:
+        return Cache()
+    if opts.cache:
+        return Cache(opts.cache)
+
+
+def add_baseline(p):
+    p.add_argument('-r', '--repeat', type=int, default=5,
+                   help='repetitions for median and IQR (default: 5)')
+    p.add_argument('-b', '--baseline', default=baseline.default_path,
+                   help='baseline file (default: baseline.json)')
+
+
+def cmd_run(opts):
+    if opts.backend == 'numpy' and not importlib.util.find_spec('numpy'):
+        sys.exit('--backend numpy requires NumPy')
+    prof = profiler(opts)
+    results = runner.report(
+        runner.run_days(list(select(opts)), opts.input, opts.mem,
+                        opts.jobs, cache(opts), prof, opts.backend))
+    if prof:
+        profiling.report(prof, results)
+
+
+def profiler(opts):
+    if opts.profile:
+        return profiling.CPUProfiler(opts.profile, opts.top)
+    if opts.memprofile:
+        return profiling.MemProfiler(opts.memprofile, opts.top)
+
+
+def cmd_bench(opts):
+    points = list(bench.bench_days(opts.days, opts.scales, opts.seed,
+                                   opts.repeat, cache(opts)))
+    bench.report(points, opts.scales, opts.threshold)
+    if opts.csv:
+        bench.write_csv(points, opts.csv)
+
+
+def cmd_baseline(opts):
+    stats = baseline.collect(list(select(opts)), opts.input, opts.repeat)
+    baseline.save(stats, opts.baseline, opts.input, opts.repeat)
+
+
+def cmd_compare(opts):
+    base = baseline.load(opts.baseline)
+    opts.input = base['input']
+    now = baseline.collect(list(select(opts)), opts.input, opts.repeat)
+    if baseline.report(baseline.compare(base['stages'], now,
+                                         opts.threshold, opts.floor)):
+        sys.exit(1)
+
+
+def select(opts):
+    for d in opts.days:
+        if days.input_path(d, opts.input).exists():
+            yield d
+        else:
+            print(f'skipping day {d:02d}: no {opts.input}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
+
+
+#------------------------------------------------------------------------------
+def test_run(capsys):
+    main([ 'run', '1-2', '-i', 'ex0.txt' ])
+    out = capsys.readouterr().out.splitlines()
+    assert out[0].split() == [ 'day', 'stage', 'answer', 'wall', 'cpu', 'peak' ]
+    rows = [ l.split() for l in out[1:-2] ]
+    assert [ r[:2] for r in rows ] == [
+        [ '1', 'parse' ], [ '1', 'part1' ], [ '1', 'part2' ],
+        [ '2', 'parse' ], [ '2', 'part1' ], [ '2', 'part2' ],
+    ]
+    assert [ r[2] for r in rows if r[1] != 'parse' ] == [ '7', '5', '150', '900' ]
+    assert out[-2].startswith('total')
+    assert out[-1].startswith('elapsed')
+
+def test_run_parallel(capsys):
+    main([ 'run', '3,1', '-i', 'ex0.txt', '-j', '2' ])
+    rows = [ l.split() for l in capsys.readouterr().out.splitlines()[1:-2] ]
+    assert [ r[0] for r in rows ] == [ '3' ]*3 + [ '1' ]*3
+
+def test_bench(capsys, tmp_path):
+    main([ 'bench', '1,21', '-s', '0.1,0.2', '--csv', str(tmp_path/'b.csv') ])
+    out = capsys.readouterr().out.splitlines()
+    assert out[0].split() == [ 'day', 'stage', '0.1x', '0.2x', 'order' ]
+    assert [ l.split()[:2] for l in out[1:] ] == [
+        [ '1', 'parse' ], [ '1', 'part1' ], [ '1', 'part2' ],
+        [ '21', 'parse' ], [ '21', 'part1' ], [ '21', 'part2' ],
+    ]
+    assert len((tmp_path/'b.csv').read_text().splitlines()) == 1 + 6 + 3
+
+def test_run_cache(capsys, tmp_path):
+    main([ 'run', '9', '-i', 'ex0.txt', '--cache', str(tmp_path) ])
+    main([ 'run', '9', '-i', 'ex0.txt', '--cache', str(tmp_path), '-j', '2' ])
+    out = capsys.readouterr().out.splitlines()
+    assert len(list(tmp_path.iterdir())) == 1
+    assert out[2].split()[2] == out[8].split()[2] == '15'
+
+def test_run_backend(capsys):
+    import pytest
+    pytest.importorskip('numpy')
+    main([ 'run', '20', '-i', 'ex0.txt', '--no-mem', '--backend', 'numpy' ])
+    rows = [ l.split() for l in capsys.readouterr().out.splitlines()[2:4] ]
+    assert [ r[2] for r in rows ] == [ '35', '3351' ]
+
+def test_run_profile(capsys, tmp_path):
+    main([ 'run', '7', '-i', 'ex0.txt', '--profile', str(tmp_path),
+           '--top', '5' ])
+    out = capsys.readouterr().out
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        '07-parse.prof', '07-parse.txt', '07-part1.prof', '07-part1.txt',
+        '07-part2.prof', '07-part2.txt' ]
+    assert '\n07 part2:\n' in out
+    assert 'crabby.py:' in out
+
+def test_run_memprofile(capsys, tmp_path):
+    main([ 'run', '7', '-i', 'ex0.txt', '--memprofile', str(tmp_path),
+           '-j', '2' ])
+    out = capsys.readouterr().out
+    assert (tmp_path/'07-parse.snap').exists()
+    assert '\n07 parse:\n    peak ' in out
+
+def test_compare(capsys, tmp_path):
+    import pytest
+    path = str(tmp_path/'b.json')
+    main([ 'baseline', '1,2', '-i', 'ex0.txt', '-r', '2', '-b', path ])
+    main([ 'compare', '1', '-r', '2', '-b', path, '-t', '1e6' ])
+    out = capsys.readouterr().out.splitlines()
+    assert [ l.split()[:2] for l in out[1:] ] == [
+        [ '1', 'parse' ], [ '1', 'part1' ], [ '1', 'part2' ] ]
+
+    # any slow down is a regression
+    stats = baseline.load(path)['stages']
+    baseline.save({ k: baseline.Stat(0, 0) for k in stats }, path, 'ex0.txt')
+    with pytest.raises(SystemExit):
+        main([ 'compare', '1', '-r', '1', '-b', path, '-t', '0', '--floor', '0' ])
+
+def test_run_skip(capsys):
+    main([ 'run', '24', '-i', 'ex0.txt', '--no-mem' ])
+    out, err = capsys.readouterr()
+    assert 'skipping day 24' in err
+    assert len(out.splitlines()) == 3
@@ -0,0 +1,143 @@
+# persistent timing baseline and regression check against it
+from datetime import datetime, timezone
+from math import inf
+from statistics import median, quantiles
+from typing import NamedTuple
+import json, platform
+
+from . import days, runner
+from .runner import fmt_time
+
+VERSION = 1
+default_path = days.root / 'baseline.json'
+
+
+class Stat(NamedTuple):
+    median: float
+    iqr: float
+
+
+class Change(NamedTuple):
+    day: int
+    stage: str
+    base: Stat
+    now: Stat
+    regressed: bool
+
+    @property
+    def ratio(self):
+        return self.now.median / self.base.median if self.base.median else inf
+
+
+def collect(days, input='input.txt', repeat=5):
+    walls = { }
+    for _ in range(repeat):
+        for r in runner.run_days(days, input, mem=False):
+            for s in r.stages:
+                walls.setdefault(f'{r.day:02d}/{s.name}', [ ]).append(s.wall)
+    return { k: stat(w) for k, w in walls.items() }
+
+
+def stat(walls):
+    if len(walls) < 2:
+        return Stat(walls[0], 0)
+    q1, _, q3 = quantiles(walls, n=4)
+    return Stat(median(walls), q3 - q1)
+
+
+def save(stats, path=default_path, input='input.txt', repeat=5):
+    with open(path, 'w') as file:
+        json.dump({
+            'version': VERSION,
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'input': input,
+            'repeat': repeat,
+            'stages': { k: { f: round(v, 7) for f, v in s._asdict().items() }
+                        for k, s in sorted(stats.items()) },
+        }, file, indent=1)
+        file.write('\n')
+
+
+def load(path=default_path):
+    with open(path) as file:
+        data = json.load(file)
+    if data.get('version') != VERSION:
+        raise ValueError(f'unsupported baseline version: {data.get("version")}')
+    data['stages'] = { k: Stat(**s) for k, s in data['stages'].items() }
+    return data
+
+
+# flag stages where median slowed by more than threshold (fraction of base)
+# and the slow down is not explained by spread of the measurements
+def compare(base, now, threshold=0.2, floor=1e-3):
+    for k, n in sorted(now.items()):
+        if not (b := base.get(k)):
+            continue
+        Δ = n.median - b.median
+        day, stage = k.split('/')
+        yield Change(int(day), stage, b, n,
+                     n.median > b.median*(1 + threshold)
+                     and Δ > max(b.iqr + n.iqr, floor))
+
+
+def report(changes, file=None):
+    print(f'{"day":>3} {"stage":<6} {"base":>8} {"±":>7} '
+          f'{"now":>8} {"±":>7} {"ratio":>6}', file=file)
+    nreg = 0
+    for c in changes:
+        nreg += c.regressed
+        print(f'{c.day:3d} {c.stage:<6} {fmt_time(c.base.median):>8} '
+              f'{fmt_time(c.base.iqr):>7} {fmt_time(c.now.median):>8} '
+              f'{fmt_time(c.now.iqr):>7} {c.ratio:6.2f}'
+              + ('  REGRESSED' if c.regressed else ''), file=file)
+    return nreg
+
+
+#------------------------------------------------------------------------------
+def test_stat():
+    assert stat([ 3 ]) == (3, 0)
+    s = stat([ 5, 1, 4, 2, 3 ])
+    assert s.median == 3
+    assert s.iqr == 3
+
+def test_collect():
+    stats = collect([ 1, 25 ], 'ex0.txt', repeat=3)
+    assert sorted(stats) == [ '01/parse', '01/part1', '01/part2',
+                              '25/parse', '25/part1' ]
+    assert all(s.median > 0 and s.iqr >= 0 for s in stats.values())
+
+def test_save_load(tmp_path):
+    stats = { '01/part1': Stat(0.5, 0.01) }
+    save(stats, tmp_path/'b.json', 'ex0.txt', 3)
+    data = load(tmp_path/'b.json')
+    assert data['stages'] == stats
+    assert data['input'] == 'ex0.txt'
+    assert data['repeat'] == 3
+
+    import pytest
+    (tmp_path/'b.json').write_text('{"version": 0}')
+    with pytest.raises(ValueError):
+        load(tmp_path/'b.json')
+
+def test_compare():
+    base = { '01/part1': Stat(0.100, 0.002), '01/part2': Stat(0.100, 0.050),
+             '02/part1': Stat(1e-5, 0), '02/part2': Stat(0.1, 0) }
+    now = { '01/part1': Stat(0.130, 0.002), '01/part2': Stat(0.130, 0.050),
+            '02/part1': Stat(1e-4, 0), '03/part1': Stat(1, 0) }
+    changes = list(compare(base, now))
+    assert [ (c.day, c.stage, c.regressed) for c in changes ] == [
+        (1, 'part1', True),     # beyond threshold and spread
+        (1, 'part2', False),    # within spread of measurements
+        (2, 'part1', False),    # too quick to matter
+    ]
+    assert round(changes[0].ratio, 6) == 1.3
+
+def test_report(capsys):
+    nreg = report([ Change(5, 'part1', Stat(0.1, 0), Stat(0.2, 0), True),
+                    Change(5, 'part2', Stat(0.1, 0), Stat(0.1, 0), False) ])
+    out = capsys.readouterr().out.splitlines()
+    assert nreg == 1
+    assert out[1].split()[-2:] == [ '2.00', 'REGRESSED' ]
+    assert out[2].split()[-1] == '1.00'
@@ -0,0 +1,125 @@
+# time vs. size curves over synthetic inputs, to expose super-linear growth
+from itertools import islice
+from math import inf, log
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import NamedTuple
+import csv
+
+from . import gen, runner
+from .runner import fmt_time
+
+
+class Point(NamedTuple):
+    day: int
+    scale: float
+    size: int       # bytes of generated input
+    stage: str
+    wall: float     # best of repeated runs
+
+
+def bench_days(days, scales, seed=0, repeat=1, cache=None):
+    for d in days:
+        yield from bench_day(d, scales, seed, repeat, cache)
+
+
+def bench_day(day, scales, seed=0, repeat=1, cache=None):
+    g = gen.gens[day]
+    if g.fixed:
+        scales = scales[:1]
+
+    with TemporaryDirectory() as tmp:
+        for scale in scales:
+            path = Path(tmp) / f'{day:02d}-{scale}.txt'
+            path.write_text(text := gen.generate(day, scale, seed))
+
+            best = { }
+            for _ in range(repeat):
+                for s in islice(runner.measure(day, path, cache=cache),
+                                1 + g.parts):
+                    best[s.name] = min(best.get(s.name, inf), s.wall)
+
+            for stage, wall in best.items():
+                yield Point(day, scale, len(text), stage, wall)
+
+
+# least squares slope of log(time) vs log(scale):
+# ~1 for linear, ~2 for quadratic, etc
+# (NB scale is nominal size, bytes of input may not be proportional)
+def order(pts):
+    if len(pts) < 2:
+        return None
+    xs = [ log(p.scale) for p in pts ]
+    ys = [ log(max(p.wall, 1e-9)) for p in pts ]
+    mx, my = sum(xs)/len(xs), sum(ys)/len(ys)
+    sxx = sum((x - mx)**2 for x in xs)
+    if not sxx:
+        return None
+    return sum((x - mx)*(y - my) for x, y in zip(xs, ys)) / sxx
+
+
+def report(points, scales, threshold=1.25, file=None):
+    print(f'{"day":>3} {"stage":<6} '
+          + ''.join(f'{f"{s:g}x":>9}' for s in scales)
+          + f'{"order":>7}', file=file)
+
+    for (day, stage), pts in group(points):
+        k = order(pts)
+        walls = { p.scale: p.wall for p in pts }
+        # ignore noise from stages too quick to matter
+        slow = k is not None and k > threshold and max(walls.values()) > 0.01
+        print(f'{day:3d} {stage:<6} '
+              + ''.join(f'{fmt_time(walls[s]) if s in walls else "-":>9}'
+                        for s in scales)
+              + (f'{k:7.2f}' if k is not None else f'{"-":>7}')
+              + (' *' if slow else ''), file=file)
+
+
+def group(points):
+    groups = { }
+    for p in points:
+        groups.setdefault((p.day, p.stage), [ ]).append(p)
+    return groups.items()
+
+
+def write_csv(points, path):
+    with open(path, 'w', newline='') as file:
+        out = csv.writer(file)
+        out.writerow(Point._fields)
+        out.writerows(points)
+
+
+#------------------------------------------------------------------------------
+def test_bench_day():
+    pts = list(bench_day(1, [ 0.1, 0.2 ], repeat=2))
+    assert [ (p.scale, p.stage) for p in pts ] == [
+        (0.1, 'parse'), (0.1, 'part1'), (0.1, 'part2'),
+        (0.2, 'parse'), (0.2, 'part1'), (0.2, 'part2'),
+    ]
+    assert pts[0].size < pts[3].size
+
+def test_bench_fixed():
+    pts = list(bench_day(24, [ 1, 10 ]))
+    assert { p.scale for p in pts } == { 1 }
+
+def test_order():
+    def pts(f):
+        return [ Point(0, n, 100*n, '', f(n)) for n in (10, 100, 1000) ]
+    assert round(order(pts(lambda n: 3e-6*n)), 6) == 1
+    assert round(order(pts(lambda n: 1e-6*n*n)), 6) == 2
+    assert order(pts(lambda n: 1)[:1]) is None
+
+def test_report(capsys):
+    pts = [ Point(5, s, 1000*s, 'part1', 0.01*s*s) for s in (1, 10) ] \
+        + [ Point(5, s, 1000*s, 'part2', 0.01*s) for s in (1, 10) ]
+    report(pts, [ 1, 10, 100 ])
+    out = capsys.readouterr().out.splitlines()
+    assert out[0].split() == [ 'day', 'stage', '1x', '10x', '100x', 'order' ]
+    assert out[1].split() == [ '5', 'part1', '10ms', '1s', '-', '2.00', '*' ]
+    assert out[2].split() == [ '5', 'part2', '10ms', '100ms', '-', '1.00' ]
+
+def test_write_csv(tmp_path):
+    pts = [ Point(1, 1, 100, 'parse', 0.5) ]
+    write_csv(pts, tmp_path/'b.csv')
+    assert (tmp_path/'b.csv').read_text().splitlines() == [
+        'day,scale,size,stage,wall', '1,1,100,parse,0.5' ]
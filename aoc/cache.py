@@ -0,0 +1,143 @@
+# content addressed cache of parsed inputs, keyed by hashes of the input file
+# and the solution script, with any aoc.* modules it uses (so any change to
+# read() or its helpers invalidates entries)
+from hashlib import sha256
+from pathlib import Path
+from types import ModuleType
+import os, pickle, sys
+
+from . import days
+
+default_dir = Path(os.environ.get('AOC_CACHE', days.root / '.cache'))
+
+
+class Cache:
+    def __init__(self, dir=default_dir, limit=256<<20):
+        self.dir = Path(dir)
+        self.limit = limit      # total bytes kept before evicting LRU entries
+
+    def read(self, mod, path):
+        file = self.entry(mod, path)
+        try:
+            with open(file, 'rb') as f:
+                data = pickle.load(f)
+            os.utime(file)      # mtime tracks recent use for eviction
+            return data
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+        with open(path) as f:
+            data = mod.read(f)
+        self.store(file, data)
+        return data
+
+    def entry(self, mod, path):
+        src = b''.join(Path(f).read_bytes() for f in sources(mod))
+        return self.dir / '-'.join((mod.__name__,
+                                    digest(Path(path).read_bytes()),
+                                    digest(src)))
+
+    def store(self, file, data):
+        try:
+            buf = pickle.dumps(data, protocol=5)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return              # just don't cache unpicklable data
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = file.with_suffix(f'.{os.getpid()}')
+        tmp.write_bytes(buf)
+        os.replace(tmp, file)   # NB atomic wrt parallel workers
+        self.evict()
+
+    def evict(self):
+        entries = sorted(((s := f.stat()).st_mtime, s.st_size, f)
+                         for f in self.dir.glob('*-*-*')
+                         if not f.suffix)
+        total = sum(n for _, n, _ in entries)
+        for _, n, f in entries:
+            if total <= self.limit:
+                break
+            f.unlink(missing_ok=True)
+            total -= n
+
+
+def digest(buf):
+    return sha256(buf).hexdigest()[:16]
+
+
+# source files of day script and the shared aoc.* modules it imports from
+def sources(mod):
+    deps = set()
+    for v in vars(mod).values():
+        name = v.__name__ if isinstance(v, ModuleType) \
+            else getattr(v, '__module__', None)
+        if isinstance(name, str) and name.startswith('aoc.') \
+           and (dep := sys.modules.get(name)):
+            deps.add(dep.__file__)
+    return [ mod.__file__, *sorted(deps) ]
+
+
+#------------------------------------------------------------------------------
+def test_read(tmp_path):
+    cache = Cache(tmp_path)
+    mod = days.load(20)
+    path = days.input_path(20, 'ex0.txt')
+
+    filt, img = cache.read(mod, path)
+    entry, = tmp_path.iterdir()
+    assert entry.name.startswith('enhance-')
+
+    # subsequent hit loads pickle, NOT parsed text
+    entry.write_bytes(pickle.dumps((b'#', mod.Image([ b'\1' ]))))
+    filt, img = cache.read(mod, path)
+    assert filt == b'#'
+    assert img.count() == 1
+
+    # different input is a different entry
+    cache.read(mod, days.input_path(20, 'input.txt'))
+    assert len(list(tmp_path.iterdir())) == 2
+
+def test_sources(tmp_path, monkeypatch):
+    assert sources(days.load(1)) == [ days.load(1).__file__ ]
+    mod = days.load(20)
+    grid = sys.modules['aoc.grid']
+    assert sources(mod) == [ mod.__file__, grid.__file__ ]
+
+    # changing a shared helper misses the cache
+    cache = Cache(tmp_path / 'cache')
+    path = days.input_path(20, 'ex0.txt')
+    dep = tmp_path / 'grid.py'
+    dep.write_bytes(Path(grid.__file__).read_bytes())
+    monkeypatch.setattr(grid, '__file__', str(dep))
+    old = cache.entry(mod, path)
+    cache.read(mod, path)
+    assert old.exists()
+    dep.write_bytes(dep.read_bytes() + b'# changed\n')
+    assert cache.entry(mod, path) != old
+    cache.read(mod, path)
+    assert cache.entry(mod, path).exists()
+
+def test_corrupt(tmp_path):
+    cache = Cache(tmp_path)
+    mod = days.load(1)
+    path = days.input_path(1, 'ex0.txt')
+    cache.entry(mod, path).write_bytes(b'junk')
+    assert cache.read(mod, path) == mod.read(path.open())
+    assert pickle.loads(cache.entry(mod, path).read_bytes()) \
+        == cache.read(mod, path)
+
+def test_evict(tmp_path):
+    cache = Cache(tmp_path)
+    mod = days.load(1)
+    ex0, inp = days.input_path(1, 'ex0.txt'), days.input_path(1, 'input.txt')
+    cache.read(mod, ex0)
+    os.utime(cache.entry(mod, ex0), (0, 0))     # least recently used
+    cache.limit = cache.entry(mod, ex0).stat().st_size + 1
+    cache.read(mod, inp)
+    assert not cache.entry(mod, ex0).exists()
+    assert not cache.entry(mod, inp).exists()   # too big alone
+
+    cache.limit = 1<<20
+    cache.read(mod, ex0)
+    cache.read(mod, inp)
+    assert cache.entry(mod, ex0).exists() and cache.entry(mod, inp).exists()
@@ -0,0 +1,63 @@
+# discovery and loading of daily solution scripts (NN/*.py)
+from pathlib import Path
+import importlib.util, sys
+
+root = Path(__file__).resolve().parent.parent
+
+
+def all_days():
+    return [ int(d.name) for d in sorted(root.glob('[0-9][0-9]'))
+             if d.is_dir() ]
+
+
+def parse_days(spec):
+    if spec == 'all':
+        return all_days()
+
+    days = [ ]
+    for r in spec.split(','):
+        d0, _, d1 = r.partition('-')
+        days.extend(range(int(d0), int(d1 or d0) + 1))
+    return days
+
+
+def script(day):
+    src, = (root / f'{day:02d}').glob('*.py')
+    return src
+
+
+def input_path(day, input='input.txt'):
+    return root / f'{day:02d}' / input
+
+
+def load(day):
+    src = script(day)
+    name = src.stem
+
+    # reuse module if already imported (eg, collected by pytest)
+    if (mod := sys.modules.get(name)) \
+            and Path(getattr(mod, '__file__', '')).resolve() == src:
+        return mod
+
+    spec = importlib.util.spec_from_file_location(name, src)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+#------------------------------------------------------------------------------
+def test_all_days():
+    assert all_days() == list(range(1, 25+1))
+
+def test_parse_days():
+    assert parse_days('7') == [ 7 ]
+    assert parse_days('01-03') == [ 1, 2, 3 ]
+    assert parse_days('1,5,9-11') == [ 1, 5, 9, 10, 11 ]
+    assert parse_days('all') == all_days()
+
+def test_load():
+    mod = load(1)
+    assert mod.__name__ == 'sonar'
+    assert load(1) is mod
+    assert script(1) == root / '01' / 'sonar.py'
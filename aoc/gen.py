@@ -0,0 +1,439 @@
+# seeded generators of synthetic puzzle inputs, scaled relative to the size of
+# a typical puzzle input (scale=1): counts of lines, scanners, cuboids, etc.
+# scale linearly and 2D grids scale by area
+from itertools import permutations, product
+from math import log2, log10, sqrt
+from random import Random
+from typing import NamedTuple, Callable
+
+
+class Gen(NamedTuple):
+    fn: Callable
+    fixed: bool = False     # input size is inherent to puzzle (scale ignored)
+    parts: int = 2          # parts that remain tractable for scaled inputs
+
+
+gens = { }
+
+
+def generator(day, **kw):
+    def reg(fn):
+        gens[day] = Gen(fn, **kw)
+        return fn
+    return reg
+
+
+def generate(day, scale=1, seed=0):
+    return gens[day].fn(Random(f'{day}:{seed}'), scale)
+
+
+def count(n, scale, min=1):
+    return max(min, round(n*scale))
+
+
+def side(n, scale, min=2):
+    return max(min, round(n*sqrt(scale)))
+
+
+def lines(it):
+    return ''.join(f'{l}\n' for l in it)
+
+
+#------------------------------------------------------------------------------
+@generator(1)
+def sonar(rng, scale):
+    def walk(d):
+        for _ in range(count(2000, scale)):
+            yield (d := max(0, d + rng.randint(-10, 20)))
+    return lines(walk(rng.randrange(100, 200)))
+
+
+@generator(2)
+def pilot(rng, scale):
+    return lines(f'{rng.choice(("forward", "forward", "down", "up"))} '
+                 f'{rng.randint(1, 9)}'
+                 for _ in range(count(1000, scale)))
+
+
+@generator(3)
+def diag(rng, scale):
+    # widen words to keep reports unique, so ratings are well defined
+    w = 12 + max(0, round(log2(scale)))
+    return lines(f'{d:0{w}b}'
+                 for d in rng.sample(range(1 << w), count(1000, scale)))
+
+
+@generator(4)
+def bingo(rng, scale):
+    def board():
+        nums = rng.sample(range(100), 25)
+        return '\n' + lines(' '.join(f'{n:2d}' for n in nums[r:r+5])
+                            for r in range(0, 25, 5))
+
+    return ','.join(str(n) for n in rng.sample(range(100), 100)) + '\n' \
+        + ''.join(board() for _ in range(count(100, scale)))
+
+
+@generator(5)
+def vents(rng, scale):
+    N = 990
+
+    def line():
+        x0, y0 = rng.randrange(N), rng.randrange(N)
+        match rng.randrange(3):
+            case 0: x1, y1 = rng.randrange(N), y0
+            case 1: x1, y1 = x0, rng.randrange(N)
+            case _:
+                Δx, Δy = rng.choice((-1, 1)), rng.choice((-1, 1))
+                n = rng.randint(0, min(x0 if Δx < 0 else N-1 - x0,
+                                       y0 if Δy < 0 else N-1 - y0))
+                x1, y1 = x0 + n*Δx, y0 + n*Δy
+        return f'{x0},{y0} -> {x1},{y1}'
+
+    return lines(line() for _ in range(count(500, scale)))
+
+
+@generator(6)
+def fishy(rng, scale):
+    return ','.join(str(rng.randint(1, 5))
+                    for _ in range(count(300, scale))) + '\n'
+
+
+@generator(7)
+def crabby(rng, scale):
+    return ','.join(str(int(rng.triangular(0, 2000, 0)))
+                    for _ in range(count(1000, scale))) + '\n'
+
+
+@generator(8)
+def segs(rng, scale):
+    digits = ('abcefg', 'cf', 'acdeg', 'acdfg', 'bcdf',
+              'abdfg', 'abdefg', 'acf', 'abcdefg', 'abcdfg')
+
+    def note():
+        wire = dict(zip('abcdefg', rng.sample('abcdefg', 7)))
+        def show(d):
+            return ''.join(rng.sample([ wire[s] for s in d ], len(d)))
+        return ' '.join(show(d) for d in rng.sample(digits, 10)) + ' | ' \
+            + ' '.join(show(rng.choice(digits)) for _ in range(4))
+
+    return lines(note() for _ in range(count(200, scale)))
+
+
+def digit_grid(rng, w, h, digits):
+    return lines(''.join(str(rng.choice(digits)) for _ in range(w))
+                 for _ in range(h))
+
+
+@generator(9)
+def smokey(rng, scale):
+    n = side(100, scale, 3)
+    return digit_grid(rng, n, n, (*range(9), 9, 9))
+
+
+@generator(10)
+def syntax(rng, scale):
+    closer = dict(zip('([{<', ')]}>'))
+
+    def line():
+        s, ctx = [ ], [ ]
+        n = rng.randint(60, 110)
+        bad = rng.randrange(2*n)  # corrupt about half of the lines
+        for i in range(n):
+            if i == bad and ctx:
+                s.append(rng.choice([ c for c in ')]}>' if c != ctx[-1] ]))
+            elif ctx and rng.random() < 0.45:
+                s.append(ctx.pop())
+            else:
+                s.append(o := rng.choice('([{<'))
+                ctx.append(closer[o])
+
+        if not ctx:
+            s.append(rng.choice('([{<'))
+        return ''.join(s)
+
+    return lines(line() for _ in range(count(94, scale)))
+
+
+@generator(11, parts=1)  # large grids need not ever synchronize
+def dumbo(rng, scale):
+    n = side(10, scale)
+    return digit_grid(rng, n, n, range(10))
+
+
+@generator(12)
+def spelunk(rng, scale):
+    # number of paths is exponential in the number of small caves,
+    # so graph is only grown by a couple of caves per decade of scale
+    ns = max(3, 6 + round(2*log10(scale)))
+    small = rng.sample([ a+b for a, b in product('abcdefghijklmnopqrstuvwxyz',
+                                                  repeat=2) ], ns)
+    big = [ s.upper() for s in rng.sample(small, max(1, ns//2)) ]
+    caves = [ 'start', 'end', *small, *big ]
+
+    edges = [ (a, b) for a, b in permutations(caves, 2)
+              if a < b and not (a.isupper() and b.isupper())
+              and { a, b } != { 'start', 'end' }
+              and rng.random() < 0.35 ]
+
+    # keep start and end reachable
+    for c in ('start', 'end'):
+        if not any(c in e for e in edges):
+            edges.append((c, rng.choice(small)))
+
+    return lines(f'{a}-{b}' for a, b in rng.sample(edges, len(edges)))
+
+
+@generator(13)
+def origami(rng, scale):
+    axes = 'xyxyxyxyxyyy'
+    w, h = 40, 6
+    folds = [ ]
+    for ax in reversed(axes):
+        if ax == 'x':
+            folds.append((ax, w))
+            w = 2*w + 1
+        else:
+            folds.append((ax, h))
+            h = 2*h + 1
+
+    # final pattern is unfolded randomly to scatter dots across sheet
+    code = [ (x, y) for x in range(40) for y in range(6)
+             if rng.random() < 0.4 ]
+    dots = set()
+    for _ in range(count(860, scale)):
+        x, y = rng.choice(code)
+        for ax, u in folds:
+            if rng.random() < 0.5:
+                if ax == 'x': x = 2*u - x
+                else: y = 2*u - y
+        dots.add((x, y))
+
+    return lines(f'{x},{y}' for x, y in dots) + '\n' \
+        + lines(f'fold along {ax}={u}' for ax, u in reversed(folds))
+
+
+@generator(14)
+def polymer(rng, scale):
+    elems = rng.sample('ABCDEFGHIJKLMNOPQRSTUVWXYZ',
+                       min(26, side(10, scale)))
+    return ''.join(rng.choices(elems, k=count(20, scale, 2))) + '\n\n' \
+        + lines(f'{a}{b} -> {rng.choice(elems)}'
+                for a, b in product(elems, repeat=2))
+
+
+@generator(15)
+def chiton(rng, scale):
+    n = side(100, scale)
+    return digit_grid(rng, n, n, range(1, 10))
+
+
+@generator(16)
+def bits(rng, scale):
+    def packet(n, depth):
+        ver = f'{rng.randrange(8):03b}'
+        if n < 3 or depth > 20:
+            v = f'{rng.getrandbits(rng.randint(1, 36)):x}'
+            return ver + '100' + ''.join(
+                f'{int(i + 1 < len(v))}{int(c, 16):04b}'
+                for i, c in enumerate(v))
+
+        type = rng.choice((0, 1, 2, 3, 5, 6, 7))
+        m = 2 if type >= 5 else rng.randint(1, min(n-1, 8))
+        cuts = sorted(rng.sample(range(1, n-1), m-1)) if m > 1 else [ ]
+        sizes = [ b - a for a, b in zip([ 0, *cuts ], [ *cuts, n-1 ]) ]
+        sub = ''.join(packet(k, depth+1) for k in sizes)
+        if len(sub) < 1<<15 and rng.random() < 0.5:
+            return f'{ver}{type:03b}0{len(sub):015b}{sub}'
+        return f'{ver}{type:03b}1{len(sizes):011b}{sub}'
+
+    s = packet(count(270, scale), 0)
+    s += '0' * (-len(s) % 16)
+    return f'{int(s, 2):0{len(s)//4}X}\n'
+
+
+@generator(17)
+def shooter(rng, scale):
+    x0, y0 = round(rng.randint(150, 250)*scale), -round(rng.randint(80, 140)*scale)
+    x1, y1 = x0 + max(1, round(rng.randint(20, 50)*scale)), \
+        y0 + max(1, round(rng.randint(20, 50)*scale))
+    return f'target area: x={max(1, x0)}..{x1}, y={y0}..{min(-1, y1)}\n'
+
+
+@generator(18)
+def snailfish(rng, scale):
+    def num(d):
+        if d == 0 or d < 4 and rng.random() < 0.6:
+            return f'[{num(d+1)},{num(d+1)}]'
+        return str(rng.randint(0, 9))
+
+    return lines(num(0) for _ in range(count(100, scale)))
+
+
+@generator(19)
+def beacons(rng, scale):
+    R, G = 1000, 2000           # scanner range and bucket size
+    bins = { }
+
+    def near(p, q=None):
+        q = q or p
+        lo = [ max(u, v) - R for u, v in zip(p, q) ]
+        hi = [ min(u, v) + R for u, v in zip(p, q) ]
+        return [ b for k in product(*(range(l//G, h//G + 1)
+                                       for l, h in zip(lo, hi)))
+                 for b in bins.get(k, ())
+                 if all(l <= u <= h for u, l, h in zip(b, lo, hi)) ]
+
+    def add_within(p, q, n):
+        lo = [ max(u, v) - R for u, v in zip(p, q) ]
+        hi = [ min(u, v) + R for u, v in zip(p, q) ]
+        while len(near(p, q)) < n:
+            b = tuple(rng.randint(l, h) for l, h in zip(lo, hi))
+            bins.setdefault(tuple(u//G for u in b), set()).add(b)
+
+    # random tree of scanners, each sharing 12+ beacons with its parent
+    pos = [ (0, 0, 0) ]
+    add_within(pos[0], pos[0], 26)
+    for _ in range(count(26, scale, 2) - 1):
+        while True:
+            Δ = [ rng.randint(-1200, 1200) for _ in range(3) ]
+            if (2*R - abs(Δ[0]))*(2*R - abs(Δ[1]))*(2*R - abs(Δ[2])) \
+                    > 0.2 * (2*R)**3:
+                break
+        parent = rng.choice(pos)
+        p = tuple(u + Δu for u, Δu in zip(parent, Δ))
+        add_within(p, parent, 12)
+        add_within(p, p, 26)
+        pos.append(p)
+
+    def report(i, p):
+        r = rng.choice(rotations)
+        pts = [ tuple(u - v for u, v in zip(b, p)) for b in near(p) ]
+        return f'--- scanner {i} ---\n' + lines(
+            ','.join(str(c[a-1] if a > 0 else -c[-a-1]) for a in r)
+            for c in rng.sample(pts, len(pts)))
+
+    return '\n'.join(report(i, p) for i, p in enumerate(pos))
+
+
+def parity(p):
+    return sum(p[i] > p[j] for i in range(3) for j in range(i+1, 3)) % 2
+
+rotations = [ tuple(s*(i+1) for s, i in zip(sgn, p))
+              for p in permutations(range(3))
+              for sgn in product((1, -1), repeat=3)
+              if (-1)**parity(p) * sgn[0]*sgn[1]*sgn[2] > 0 ]
+
+
+@generator(20)
+def enhance(rng, scale):
+    # NB lit pixels in 0 background flash on and off
+    filt = '#' + ''.join(rng.choice('#.') for _ in range(510)) + '.'
+    n = side(100, scale)
+    return filt + '\n\n' + lines(''.join(rng.choice('#.') for _ in range(n))
+                                 for _ in range(n))
+
+
+@generator(21, fixed=True)
+def dirac(rng, scale):
+    return lines(f'Player {i} starting position: {rng.randint(1, 10)}'
+                 for i in (1, 2))
+
+
+@generator(22)
+def reactor(rng, scale):
+    def cuboid(r0, r1, size):
+        return ','.join(
+            f'{a}={(u := rng.randint(r0, r1 - size))}..'
+            f'{u + rng.randint(size//4, size)}'
+            for a in 'xyz')
+
+    def outer():
+        # keep clear of initialization region, like puzzle inputs
+        while True:
+            c = cuboid(-100000, 100000, 40000)
+            if any(int(v0) > 50 or int(v1) < -50 for v0, v1 in
+                   (a[2:].split('..') for a in c.split(','))):
+                return c
+
+    n = count(420, scale, 2)
+    ninit = max(1, n//21)
+    return lines(f'{"on" if i < 2 or rng.random() < 0.6 else "off"} '
+                 + (cuboid(-50, 50, 50) if i < ninit else outer())
+                 for i in range(n))
+
+
+@generator(23, fixed=True)
+def amphipod(rng, scale):
+    pods = rng.sample('AABBCCDD', 8)
+    return '#############\n#...........#\n' \
+        f'###{"#".join(pods[:4])}###\n' \
+        f'  #{"#".join(pods[4:])}#\n' \
+        '  #########\n'
+
+
+@generator(24, fixed=True)
+def monad(rng, scale):
+    # random nesting of 7 push/pop digit pairs, which must be compatible
+    # with the constraints analysed in 24/README.md
+    digs = [ None for _ in range(14) ]
+    stack, npush = [ ], 0
+    for i in range(14):
+        if npush < 7 and (not stack or rng.random() < 0.5):
+            B = rng.randint(0, 16)
+            digs[i] = (1, rng.randint(10, 16), B)
+            stack.append(B)
+            npush += 1
+        else:
+            digs[i] = (26, rng.randint(-8, 8) - stack.pop(), rng.randint(0, 16))
+
+    return ''.join(monad_template.format(D=D, A=A, B=B) for D, A, B in digs)
+
+monad_template = '''\
+inp w
+mul x 0
+add x z
+mod x 26
+div z {D}
+add x {A}
+eql x w
+eql x 0
+mul y 0
+add y 25
+mul y x
+add y 1
+mul z y
+mul y 0
+add y w
+add y {B}
+mul y x
+add z y
+'''
+
+
+@generator(25, parts=1)
+def seacuke(rng, scale):
+    w, h = side(139, scale), side(137, scale)
+    return lines(''.join(rng.choice('>v..') for _ in range(w))
+                 for _ in range(h))
+
+
+#------------------------------------------------------------------------------
+def test_generate():
+    from io import StringIO
+    from itertools import islice
+    from . import days
+
+    assert sorted(gens) == days.all_days()
+    for d, g in gens.items():
+        text = generate(d, 0.1)
+        assert text == generate(d, 0.1)
+        assert text != generate(d, 0.1, seed=1)
+        mod = days.load(d)
+        ans = list(islice(mod.solve(mod.read(StringIO(text))), g.parts))
+        assert len(ans) == g.parts
+
+def test_scale():
+    assert len(generate(1, 10).split()) == 20000
+    assert len(generate(15, 4).split()) == 200
+    assert generate(23, 1) == generate(23, 100)
@@ -0,0 +1,118 @@
+# compact 2D grids stored row-major in a flat buffer (bytearray, array, ...),
+# optionally padded with a border so neighbors are found by fixed index
+# offsets, without any bounds checks
+from functools import cache
+from typing import NamedTuple
+
+N4 = ((0,-1), (-1,0), (1,0), (0,1))
+
+N8 = tuple((Δx, Δy)
+           for Δy in range(-1,1+1)
+           for Δx in range(-1,1+1)
+           if Δx or Δy)
+
+# translation tables from input characters to cell values
+DIGITS = bytes.maketrans(b'0123456789', bytes(range(10)))
+PIXELS = bytes.maketrans(b'.#', b'\0\1')
+
+
+class Grid(NamedTuple):
+    cells: bytearray    # row-major, including any padding
+    w: int              # row stride (including padding)
+
+    @classmethod
+    def read(cls, lines, table=DIGITS, pad=0, fill=0):
+        rows = [ parse_row(l, table) for l in lines if not l.isspace() ]
+        return cls(bytearray().join(rows), len(rows[0])).padded(pad, fill)
+
+    @property
+    def h(self):
+        return len(self.cells) // self.w
+
+    def rows(self):
+        cells, w = self
+        return [ cells[i:i+w] for i in range(0, len(cells), w) ]
+
+    def offsets(self, nbrs=N4):
+        return offsets(self.w, nbrs)
+
+    def padded(self, pad=1, fill=0):
+        if not pad:
+            return self
+        cells, w = self
+        edge = cells[:0]
+        edge.extend((fill,)*pad)
+        border = edge * (w + 2*pad)
+        dst = border[:]
+        for r in self.rows():
+            dst += edge + r + edge
+        dst += border
+        return Grid(dst, w + 2*pad)
+
+    def cropped(self, pad=1):
+        cells, w = self
+        dst = cells[:0]
+        for i in range(pad*w + pad, len(cells) - pad*w, w):
+            dst += cells[i : i+w-2*pad]
+        return Grid(dst, w - 2*pad)
+
+    # bit x of mask for each row is set where cell == val
+    def masks(self, val):
+        sel = bytes(ord('1') if i == val else ord('0') for i in range(256))
+        return [ int(r.translate(sel)[::-1], 2) for r in self.rows() ]
+
+    # (optional) NumPy array sharing the grid buffer
+    def view(self):
+        import numpy as np
+        return np.asarray(memoryview(self.cells)).reshape(-1, self.w)
+
+
+def parse_row(line, table=DIGITS):
+    return line.strip().encode().translate(table)
+
+
+# index deltas of neighbors in padded flat grid of row stride w
+@cache
+def offsets(w, nbrs=N4):
+    return tuple(Δy*w + Δx for Δx, Δy in nbrs)
+
+
+#------------------------------------------------------------------------------
+def test_read():
+    g = Grid.read([ '123\n', '456\n' ])
+    assert g == (bytearray(b'\1\2\3\4\5\6'), 3)
+    assert g.h == 2
+    assert g.rows() == [ b'\1\2\3', b'\4\5\6' ]
+
+    g = Grid.read([ '#.\n', '.#\n', '\n' ], PIXELS, pad=1, fill=9)
+    assert g.w == 4 and g.h == 4
+    assert g.cells == b'\t\t\t\t' b'\t\1\0\t' b'\t\0\1\t' b'\t\t\t\t'
+
+def test_pad():
+    from array import array
+    g = Grid(array('L', range(6)), 3)
+    p = g.padded(2, 7)
+    assert (p.w, p.h) == (7, 6)
+    assert p.cells[:7] == array('L', [ 7 ]*7)
+    assert p.cells[14:21] == array('L', [ 7, 7, 0, 1, 2, 7, 7 ])
+    assert p.cropped(2) == g
+    assert g.padded(0) is g
+
+def test_offsets():
+    assert offsets(10) == (-10, -1, 1, 10)
+    assert offsets(10, N8) == (-11, -10, -9, -1, 1, 9, 10, 11)
+    assert Grid(b'', 5).offsets(N8) is offsets(5, N8)
+
+def test_masks():
+    g = Grid.read([ '.>v', 'v>.' ], bytes.maketrans(b'.>v', b'\0\1\2'))
+    assert g.masks(1) == [ 0b010, 0b010 ]
+    assert g.masks(2) == [ 0b100, 0b001 ]
+
+def test_view():
+    import pytest
+    np = pytest.importorskip('numpy')
+    g = Grid.read([ '12', '34' ])
+    v = g.view()
+    assert v.shape == (2, 2)
+    v[1, 0] = 9
+    assert g.cells[2] == 9
@@ -0,0 +1,110 @@
+# per-stage profiling: each stage is run under cProfile or tracemalloc,
+# raw results are saved per day/stage along with a summary of the top entries
+from io import StringIO
+from pathlib import Path
+import cProfile, pstats, tracemalloc
+
+from .runner import fmt_size, fmt_time
+
+
+class Profiler:
+    ext = None
+
+    def __init__(self, dir, top=10):
+        self.dir = Path(dir)
+        self.top = top
+
+    def path(self, day, stage, ext=None):
+        return self.dir / f'{day:02d}-{stage}.{ext or self.ext}'
+
+    def run(self, day, stage, fn, *args):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        res, summary = self.profile(self.path(day, stage), fn, *args)
+        self.path(day, stage, 'txt').write_text(summary)
+        return res
+
+    def summaries(self, day, stages):
+        for s in stages:
+            if (p := self.path(day, s, 'txt')).exists():
+                yield s, p.read_text()
+
+
+class CPUProfiler(Profiler):
+    ext = 'prof'
+
+    def profile(self, path, fn, *args):
+        prof = cProfile.Profile()
+        res = prof.runcall(fn, *args)
+        prof.dump_stats(path)
+
+        stats = pstats.Stats(prof).stats
+        hot = sorted(stats.items(), key=lambda s: s[1][2], reverse=True)
+        out = StringIO()
+        print(f'{"tottime":>8} {"cumtime":>8} {"ncalls":>9}  function',
+              file=out)
+        for (file, line, func), (_, nc, tt, ct, _) in hot[:self.top]:
+            where = f'{Path(file).name}:{line}' if line else file
+            print(f'{fmt_time(tt):>8} {fmt_time(ct):>8} {nc:>9}  '
+                  f'{func} ({where})', file=out)
+        return res, out.getvalue()
+
+
+class MemProfiler(Profiler):
+    ext = 'snap'
+
+    def profile(self, path, fn, *args):
+        tracemalloc.start()
+        try:
+            snap0 = tracemalloc.take_snapshot()
+            res = fn(*args)
+            snap1 = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        ignore = (tracemalloc.Filter(False, tracemalloc.__file__),)
+        snap1 = snap1.filter_traces(ignore)
+        snap1.dump(str(path))
+
+        # allocations from this stage that are still live at the end
+        out = StringIO()
+        print(f'{"peak":>8} {fmt_size(peak):>8}', file=out)
+        print(f'{"live":>8} {"blocks":>9}  allocated at', file=out)
+        for d in snap1.compare_to(snap0.filter_traces(ignore),
+                                  'lineno')[:self.top]:
+            if d.size_diff <= 0:
+                break
+            f = d.traceback[0]
+            print(f'{fmt_size(d.size_diff):>8} {d.count_diff:>9}  '
+                  f'{Path(f.filename).name}:{f.lineno}', file=out)
+        return res, out.getvalue()
+
+
+def report(profiler, results, file=None):
+    for r in results:
+        for stage, summary in profiler.summaries(r.day,
+                                                 [ s.name for s in r.stages ]):
+            print(f'\n{r.day:02d} {stage}:', file=file)
+            print(summary, end='', file=file)
+
+
+#------------------------------------------------------------------------------
+def test_cpu(tmp_path):
+    prof = CPUProfiler(tmp_path, top=3)
+    assert prof.run(5, 'part1', sorted, [ 3, 1, 2 ]) == [ 1, 2, 3 ]
+    assert prof.path(5, 'part1').exists()
+    summary = prof.path(5, 'part1', 'txt').read_text().splitlines()
+    assert summary[0].split() == [ 'tottime', 'cumtime', 'ncalls', 'function' ]
+    assert 2 <= len(summary) <= 4
+    assert any('sorted' in l for l in summary)
+    assert pstats.Stats(str(prof.path(5, 'part1'))).total_calls >= 1
+
+def test_mem(tmp_path):
+    prof = MemProfiler(tmp_path)
+    buf = prof.run(1, 'parse', bytearray, 1<<20)
+    assert len(buf) == 1<<20
+    summary = prof.path(1, 'parse', 'txt').read_text().splitlines()
+    assert summary[0].split() == [ 'peak', '1M' ]
+    assert summary[2].split()[0] == '1M'
+    assert tracemalloc.Snapshot.load(str(prof.path(1, 'parse'))).traces
+    assert not tracemalloc.is_tracing()
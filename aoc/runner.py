@@ -0,0 +1,198 @@
+# run daily solutions in-process, measuring each parse/part stage
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+from time import perf_counter, process_time
+from typing import NamedTuple
+import tracemalloc
+
+from . import days
+
+
+class Stage(NamedTuple):
+    name: str
+    answer: object
+    wall: float         # elapsed seconds
+    cpu: float          # process CPU seconds
+    peak: int = None    # max traced bytes allocated above start of stage
+
+
+class Result(NamedTuple):
+    day: int
+    stages: list
+
+    def answers(self):
+        return [ s.answer for s in self.stages[1:] ]
+
+
+# approximate cost ranking of the slowest days (from runs of input.txt),
+# scheduled first so the longest day sets the total when run in parallel
+slowest = (23, 15, 21, 20, 5, 19, 22, 18, 25)
+
+
+def run_days(days, input='input.txt', mem=True, jobs=1, cache=None,
+             profiler=None, backend='python'):
+    args = (input, mem, cache, profiler, backend)
+    if jobs == 1:
+        yield from (run_day(d, *args) for d in days)
+        return
+
+    with ProcessPoolExecutor(jobs or None) as pool:
+        futs = { d: pool.submit(run_day, d, *args) for d in schedule(days) }
+        # results are collected in requested order, regardless of completion
+        for d in days:
+            yield futs[d].result()
+
+
+def schedule(days):
+    rank = { d: i for i, d in enumerate(slowest) }
+    return sorted(set(days), key=lambda d: rank.get(d, len(rank)))
+
+
+def run_day(day, input='input.txt', mem=True, cache=None, profiler=None,
+            backend='python'):
+    stages = list(measure(day, input, cache=cache, profiler=profiler,
+                          backend=backend))
+
+    # tracing allocations is too slow to combine with timing,
+    # so peak memory is collected from a separate pass
+    if mem:
+        tracemalloc.start()
+        try:
+            peaks = [ s.peak for s in measure(day, input, True, cache,
+                                               backend=backend) ]
+        finally:
+            tracemalloc.stop()
+        stages = [ s._replace(peak=p) for s, p in zip(stages, peaks) ]
+
+    return Result(day, stages)
+
+
+# days with alternative implementations of their hot loops list them in
+# `backends` and take the name as an extra solve() argument
+def measure(day, input='input.txt', trace=False, cache=None, profiler=None,
+            backend='python'):
+    def run(name, fn, *args):
+        if profiler:
+            fn, args = profiler.run, (day, name, fn, *args)
+        return timed(name, trace, fn, *args)
+
+    mod = days.load(day)
+    path = days.input_path(day, input)
+    if cache:
+        data, stage = run('parse', cache.read, mod, path)
+    else:
+        with open(path) as file:
+            data, stage = run('parse', mod.read, file)
+    yield stage
+
+    if backend in getattr(mod, 'backends', ()):
+        part = mod.solve(data, backend)
+    else:
+        part = mod.solve(data)
+    for i in count(1):
+        try:
+            ans, stage = run(f'part{i}', next, part)
+        except StopIteration:
+            return
+        yield stage._replace(answer=ans)
+
+
+def timed(name, trace, fn, *args):
+    if trace:
+        tracemalloc.reset_peak()
+        m0 = tracemalloc.get_traced_memory()[0]
+
+    c0, t0 = process_time(), perf_counter()
+    res = fn(*args)
+    t1, c1 = perf_counter(), process_time()
+
+    peak = tracemalloc.get_traced_memory()[1] - m0 if trace else None
+    return res, Stage(name, None, t1 - t0, c1 - c0, peak)
+
+
+def report(results, file=None):
+    print(f'{"day":>3} {"stage":<6} {"answer":>16} '
+          f'{"wall":>8} {"cpu":>8} {"peak":>8}', file=file)
+
+    t0 = perf_counter()
+    wall = cpu = 0
+    done = [ ]
+    for r in results:
+        done.append(r)
+        for s in r.stages:
+            ans = '' if s.answer is None else s.answer
+            print(f'{r.day:3d} {s.name:<6} {ans!s:>16} '
+                  f'{fmt_time(s.wall):>8} {fmt_time(s.cpu):>8} '
+                  f'{fmt_size(s.peak):>8}', file=file)
+            wall += s.wall
+            cpu += s.cpu
+
+    print(f'{"total":<27} {fmt_time(wall):>8} {fmt_time(cpu):>8}', file=file)
+    print(f'{"elapsed":<27} {fmt_time(perf_counter() - t0):>8}', file=file)
+    return done
+
+
+def fmt_time(t):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):  # pragma: no branch
+        if t >= scale:
+            break
+    return f'{t/scale:.3g}{unit}'
+
+
+def fmt_size(n):
+    if n is None:
+        return '-'
+    for unit in 'BKMG':  # pragma: no branch
+        if n < 1024 or unit == 'G':
+            break
+        n /= 1024
+    return f'{n:.3g}{unit}'
+
+
+#------------------------------------------------------------------------------
+def test_run_day():
+    res = run_day(1, 'ex0.txt')
+    assert res.day == 1
+    assert [ s.name for s in res.stages ] == [ 'parse', 'part1', 'part2' ]
+    assert res.answers() == [ 7, 5 ]
+    assert all(s.wall >= 0 and s.cpu >= 0 and s.peak >= 0
+               for s in res.stages)
+
+def test_run_day_nomem():
+    res = run_day(25, 'ex0.txt', mem=False)
+    assert res.answers() == [ 58 ]
+    assert all(s.peak is None for s in res.stages)
+
+def test_run_days():
+    res = list(run_days([ 2, 1, 5 ], 'ex0.txt', mem=False, jobs=2))
+    assert [ r.day for r in res ] == [ 2, 1, 5 ]
+    assert [ r.answers() for r in res ] == [ [ 150, 900 ], [ 7, 5 ], [ 5, 12 ] ]
+    serial = run_days([ 2, 1, 5 ], 'ex0.txt', mem=False)
+    assert [ r.answers() for r in serial ] == [ r.answers() for r in res ]
+
+def test_run_backend():
+    import pytest
+    pytest.importorskip('numpy')
+    res = run_days([ 4, 5, 9, 11, 20, 1 ], 'ex0.txt', mem=False,
+                   backend='numpy')
+    ref = run_days([ 4, 5, 9, 11, 20, 1 ], 'ex0.txt', mem=False)
+    assert [ r.answers() for r in res ] == [ r.answers() for r in ref ]
+
+def test_schedule():
+    assert schedule([ 1, 2, 19, 23, 20, 1 ]) == [ 23, 20, 19, 1, 2 ]
+
+def test_run_day_cached(tmp_path):
+    from .cache import Cache
+    cache = Cache(tmp_path)
+    res = [ run_day(4, 'ex0.txt', cache=cache) for _ in range(2) ]
+    assert len(list(tmp_path.iterdir())) == 1
+    assert res[0].answers() == res[1].answers() == [ 4512, 1924 ]
+
+def test_fmt():
+    assert fmt_time(2.5) == '2.5s'
+    assert fmt_time(0.0123) == '12.3ms'
+    assert fmt_time(4.2e-5) == '42µs'
+    assert fmt_time(0) == '0µs'
+    assert fmt_size(None) == '-'
+    assert fmt_size(512) == '512B'
+    assert fmt_size(3<<20) == '3M'
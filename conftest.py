@@ -5,6 +5,22 @@ pytest_plugins = "pytester"
 collect_ignore = [ 'template.py' ]
 
 
+def pytest_addoption(parser):
+    parser.addoption('--subprocess', action='store_true',
+                     help='run all script tests in a separate interpreter')
+
+
+# the first script test of each day always runs as a separate script, so
+# every day is checked to run standalone (as documented) on each test run
+def pytest_collection_modifyitems(items):
+    days = set()
+    for item in items:
+        if 'ascript' in getattr(item, 'fixturenames', ()) \
+                and item.path not in days:
+            days.add(item.path)
+            item.add_marker(pytest.mark.subprocess)
+
+
 @pytest.fixture
 def data(request):
     cwd = Path(request.fspath).parent
@@ -12,10 +28,40 @@ def data(request):
 
 
 @pytest.fixture
-def ascript(request, pytester):
+def ascript(request):
+    if request.config.getoption('subprocess') \
+            or request.node.get_closest_marker('subprocess'):
+        return script_subprocess(request, request.getfixturevalue('pytester'))
+    return script_inprocess(request, request.getfixturevalue('capsys'),
+                            request.getfixturevalue('monkeypatch'))
+
+
+# call main() of the already imported test module with patched argv
+# (and stdin, to pipe the input instead of naming the file)
+def script_inprocess(request, capsys, monkeypatch):
+    dir = Path(request.fspath).parent
+    def runner(inp, stdin=False):
+        arg = str(dir/inp)
+        if stdin:
+            monkeypatch.setattr(sys, 'stdin', (dir/inp).open())
+            arg = '-'
+        monkeypatch.setattr(sys, 'argv', [ str(request.fspath), arg ])
+        capsys.readouterr()
+        request.module.main()
+        out, err = capsys.readouterr()
+        assert not err
+        return out
+    return runner
+
+
+def script_subprocess(request, pytester):
     dir = Path(request.fspath).parent
-    def runner(inp):
-        result = pytester.run(sys.executable, request.fspath, str(dir/inp))
+    def runner(inp, stdin=False):
+        if stdin:
+            result = pytester.run(sys.executable, request.fspath, '-',
+                                  stdin=(dir/inp).read_bytes())
+        else:
+            result = pytester.run(sys.executable, request.fspath, str(dir/inp))
         assert result.ret == 0
         assert not result.errlines
         return str(result.stdout) + '\n' # just assume trailing newline
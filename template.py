@@ -16,7 +16,7 @@ chainit = chain.from_iterable
 
 def main():
     from sys import argv, stdin
-    with open(argv[1]) as file:
+    with (open(argv[1]) if argv[1] != '-' else stdin) as file:
         data = read(file)
     print(data)
 